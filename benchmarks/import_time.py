@@ -0,0 +1,106 @@
+"""Reports per-module import cost of lib_common and checks it against stored baselines.
+
+    python benchmarks/import_time.py [--runs N] [--strict]   # compare with benchmarks/import_baseline.json
+    python benchmarks/import_time.py --save                  # store results as the new baseline
+
+Each module is imported in a fresh interpreter with -X importtime and the best of N runs is kept.
+A module is over budget when slower than its baseline by more than --tolerance, import times
+vary a lot between runs so the default only catches large regressions, or when it loads a
+lazy dependency eagerly. With --strict the exit code is 1 if any module is over budget.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+from machine import get_machine_info
+
+BENCH_PATH = os.path.dirname(os.path.abspath(__file__))
+SRC_PATH = os.path.join(os.path.dirname(BENCH_PATH), 'src')
+BASELINE_FILE = os.path.join(BENCH_PATH, 'import_baseline.json')
+
+MODULES = (
+    'lib_common.chrono.calendar',
+    'lib_common.chrono.tenor',
+    'lib_common.chrono.frequency',
+    'lib_common.date_helper',
+    'lib_common.numeric.interpolator',
+    'lib_common.numeric.solver',
+    'lib_common.models.future',
+    'lib_common.models.market_snapshot',
+    'lib_common.app.plotter',
+    'lib_common.request_web',
+    'lib_common.sql',
+)
+# dependencies which should only be loaded on first use
+LAZY_MODULES = ('pandas', 'scipy', 'plotly', 'holidays', 'requests')
+TOP_COUNT = 5
+
+
+def measure_import(module: str) -> tuple[float, list[tuple[float, str]], list[str]]:
+    """Returns cumulative import time (ms), top imported modules by self time and lazy modules loaded."""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [SRC_PATH, os.environ.get('PYTHONPATH')])))
+    code = f"import sys, {module}; print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    res = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                         env=env, capture_output=True, text=True, check=True)
+    total, selfs = 0.0, []
+    for line in res.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        selfs.append((int(self_us) / 1e3, name.strip()))
+        if name.strip() == module:
+            total = int(cumulative_us) / 1e3
+    selfs.sort(reverse=True)
+    lazy_loaded = [m for m in res.stdout.strip().split(',') if m]
+    return total, selfs[:TOP_COUNT], lazy_loaded
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('--baseline', default=BASELINE_FILE)
+    parser.add_argument('--save', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=1.0)
+    parser.add_argument('--strict', action='store_true')
+    parser.add_argument('modules', nargs='*', default=list(MODULES))
+    args = parser.parse_args()
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            stored = json.load(f)
+        baseline = stored.get('results', {})
+        if stored.get('machine') != get_machine_info():
+            print(f"Baseline recorded on {stored.get('machine')}, comparison is indicative only")
+
+    results, failed = {}, []
+    print(f"{'module':<36} {'ms':>8} {'baseline':>8} {'ratio':>6}  eager heavy deps / top self times")
+    for module in args.modules:
+        runs = [measure_import(module) for _ in range(args.runs)]
+        total, top, lazy_loaded = min(runs, key=lambda r: r[0])
+        results[module] = total
+        base = baseline.get(module)
+        ratio = total / base if base else None
+        over = (ratio is not None and ratio > 1 + args.tolerance) or bool(lazy_loaded)
+        if over:
+            failed.append(module)
+        status = 'OVER' if over else 'ok'
+        base_str, ratio_str = (f'{base:.1f}', f'{ratio:.2f}') if base else ('-', '-')
+        print(f"{module:<36} {total:>8.1f} {base_str:>8} {ratio_str:>6}  {status} {','.join(lazy_loaded) or '-'}")
+        for self_ms, name in top:
+            print(f"{'':<4}{name:<48} {self_ms:>8.1f}")
+
+    if args.save:
+        stored = {'machine': get_machine_info(), 'results': {**baseline, **results}}
+        with open(args.baseline, 'w') as f:
+            json.dump(stored, f, indent=2, sort_keys=True)
+        print(f'Saved baseline to {args.baseline}')
+    if failed:
+        print(f"Over budget: {', '.join(failed)}")
+    return 1 if failed and args.strict else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
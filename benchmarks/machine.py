@@ -0,0 +1,9 @@
+import platform
+
+
+def get_machine_info() -> dict[str, str]:
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+    }
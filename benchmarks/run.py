@@ -0,0 +1,101 @@
+"""Runs lib_common benchmarks and compares against stored baselines.
+
+    python benchmarks/run.py                  # run and compare with benchmarks/baseline.json
+    python benchmarks/run.py --save           # run and store results as the new baseline
+    python benchmarks/run.py -k chrono        # only workloads containing 'chrono'
+
+Each workload runs in a fresh interpreter so results do not depend on which workloads ran before.
+Timings are the best of --repeat rounds, each averaged over enough calls to last ~0.2s.
+With --strict the exit code is 1 if any workload is slower than baseline by more than --tolerance.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import timeit
+
+BENCH_PATH = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(BENCH_PATH), 'src'))
+
+from machine import get_machine_info  # noqa: E402
+from workloads import WORKLOADS  # noqa: E402
+
+BASELINE_FILE = os.path.join(BENCH_PATH, 'baseline.json')
+
+
+def time_workload(name: str, repeat: int) -> float:
+    """Returns best time per call in seconds."""
+    func = WORKLOADS[name]()
+    # warm up lazy imports and caches
+    func()
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    number = max(1, number // 2)
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def run_workload(name: str, repeat: int) -> float:
+    res = subprocess.run([sys.executable, __file__, '--worker', name, '--repeat', str(repeat)],
+                         capture_output=True, text=True, check=True)
+    return float(res.stdout.strip().splitlines()[-1])
+
+
+def format_time(secs: float) -> str:
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if secs >= scale:
+            return f'{secs / scale:.2f}{unit}'
+    return f'{secs / 1e-9:.0f}ns'
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('-k', '--filter', default='')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--baseline', default=BASELINE_FILE)
+    parser.add_argument('--save', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    parser.add_argument('--strict', action='store_true')
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(time_workload(args.worker, args.repeat))
+        return 0
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            stored = json.load(f)
+        baseline = stored.get('results', {})
+        if stored.get('machine') != get_machine_info():
+            print(f"Baseline recorded on {stored.get('machine')}, comparison is indicative only")
+
+    results, regressions = {}, []
+    print(f"{'workload':<60} {'time':>10} {'baseline':>10} {'ratio':>7}")
+    for name in WORKLOADS:
+        if args.filter not in name:
+            continue
+        secs = results[name] = run_workload(name, args.repeat)
+        base = baseline.get(name)
+        if base:
+            ratio = secs / base
+            flag = 'SLOWER' if ratio > 1 + args.tolerance else 'faster' if ratio < 1 - args.tolerance else ''
+            if flag == 'SLOWER':
+                regressions.append(name)
+            print(f'{name:<60} {format_time(secs):>10} {format_time(base):>10} {ratio:>7.2f} {flag}')
+        else:
+            print(f"{name:<60} {format_time(secs):>10} {'-':>10} {'-':>7}")
+
+    if args.save:
+        stored = {'machine': get_machine_info(), 'results': {**baseline, **results}}
+        with open(args.baseline, 'w') as f:
+            json.dump(stored, f, indent=2, sort_keys=True)
+        print(f'Saved baseline to {args.baseline}')
+    if regressions:
+        print(f"Slower than baseline: {', '.join(regressions)}")
+    return 1 if regressions and args.strict else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""Benchmark workloads for lib_common hot paths.
+
+Each workload is a setup function returning the callable to time, registered by name.
+"""
+import datetime as dtm
+import logging
+import random
+from typing import Callable
+
+import numpy as np
+
+from lib_common.chrono.badjust import BDayAdjust, BDayAdjustType, get_adjusted_date
+from lib_common.chrono.calendar import CalendarID
+from lib_common.chrono.daycount import DayCount
+from lib_common.chrono.frequency import Compounding, Frequency
+from lib_common.chrono.roll import RollConvention, RollConventionType
+from lib_common.chrono.tenor import Tenor
+from lib_common.models.data_series import DataSeries
+from lib_common.numeric import solver
+from lib_common.numeric.discount import DiscountEvaluator
+from lib_common.numeric.interpolator import LogCubicSplineNatural, LogLinear, Step
+from lib_common.numeric.solver import find_fit, find_root
+
+WORKLOADS: dict[str, Callable[[], Callable[[], object]]] = {}
+
+START_DATE = dtm.date(2024, 1, 31)
+CALENDAR = CalendarID.USEX
+
+
+def workload(name: str):
+    def register(setup: Callable[[], Callable[[], object]]):
+        WORKLOADS[name] = setup
+        return setup
+    return register
+
+
+def _get_random_dates(size: int, years: int = 30, seed: int = 1) -> list[dtm.date]:
+    rng = random.Random(seed)
+    return [START_DATE + dtm.timedelta(days=rng.randrange(years * 365)) for _ in range(size)]
+
+
+def _get_curve_knots(count: int = 40) -> list[tuple[float, float]]:
+    # discount factors for a flat-ish 4% curve out to 30y
+    xs = np.concatenate([[0.0], np.geomspace(1 / 52, 30, count - 1)])
+    return [(x, float(np.exp(-(0.04 + 0.002 * np.log1p(x)) * x))) for x in xs]
+
+
+def _get_daily_grid(years: int = 30) -> list[float]:
+    return (np.arange(years * 365) / 365.0).tolist()
+
+
+# chrono
+@workload('chrono.tenor.generate_series_30y_monthly')
+def _():
+    tenor = Tenor.cached('1m')
+    bd_adjust = BDayAdjust.cached(BDayAdjustType.ModifiedFollowing, CALENDAR)
+    end_date = dtm.date(START_DATE.year + 30, START_DATE.month, START_DATE.day)
+    return lambda: tenor.generate_series(START_DATE, end_date, bd_adjust=bd_adjust, inclusive=True)
+
+
+@workload('chrono.frequency.generate_schedule_30y_quarterly_eom')
+def _():
+    bd_adjust = BDayAdjust.cached(BDayAdjustType.ModifiedFollowing, CALENDAR)
+    roll = RollConvention.cached(RollConventionType.EndOfMonth)
+    return lambda: Frequency.Quarterly.generate_schedule(
+        START_DATE, Tenor.cached('30y'), bd_adjust=bd_adjust, roll_convention=roll)
+
+
+@workload('chrono.badjust.get_adjusted_date_10k')
+def _():
+    dates = _get_random_dates(10_000, years=6)
+    return lambda: [get_adjusted_date(BDayAdjustType.ModifiedFollowing, d, CALENDAR) for d in dates]
+
+
+@workload('chrono.tenor.get_dates_simple_100k')
+def _():
+    dates = np.array(_get_random_dates(100_000), dtype='datetime64[D]')
+    tenor = Tenor.cached('3m')
+    return lambda: tenor.get_dates_simple(dates)
+
+
+@workload('chrono.tenor.bday_get_date_simple_10k')
+def _():
+    dates = _get_random_dates(10_000, years=6)
+    tenor = Tenor.bday(2, CALENDAR)
+    return lambda: [tenor.get_date_simple(d) for d in dates]
+
+
+for _dc in (DayCount.ACT360, DayCount.ACTACT, DayCount._30360, DayCount.BD252):
+    @workload(f'chrono.daycount.get_dcf_{_dc.value}_10k')
+    def _(dc=_dc):
+        from_dates = _get_random_dates(10_000, years=6, seed=2)
+        to_dates = _get_random_dates(10_000, years=6, seed=3)
+        pairs = [(min(f, t), max(f, t)) for f, t in zip(from_dates, to_dates)]
+        # ACTACT does not support 29-Feb end dates
+        pairs = [(f, t) for f, t in pairs if (t.month, t.day) != (2, 29)]
+        return lambda: [dc.get_dcf(f, t, CALENDAR) for f, t in pairs]
+
+
+# numeric
+for _interp_type in (LogCubicSplineNatural, LogLinear, Step):
+    @workload(f'numeric.interpolator.{_interp_type.__name__}_40_knots_daily_30y')
+    def _(interp_type=_interp_type):
+        interp = interp_type(_get_curve_knots())
+        grid = _get_daily_grid()
+        return lambda: [interp.get_value(x) for x in grid]
+
+
+@workload('numeric.solver.find_root_100')
+def _():
+    interp = LogLinear(_get_curve_knots())
+    targets = np.linspace(0.3, 0.99, 100).tolist()
+    return lambda: [find_root(lambda x, t: interp.get_value(x) - t, args=(t,), bracket=(0, 30)) for t in targets]
+
+
+@workload('numeric.solver.find_fit_nelson_siegel')
+def _():
+    solver.logger.setLevel(logging.CRITICAL)
+    knots = _get_curve_knots()[1:]
+    xs = np.array([x for x, _ in knots])
+    rates = np.array([-np.log(y) / x for x, y in knots])
+
+    def cost(params):
+        b0, b1, b2 = params
+        decay = (1 - np.exp(-xs / 2)) / (xs / 2)
+        return np.sum((b0 + b1 * decay + b2 * (decay - np.exp(-xs / 2)) - rates) ** 2)
+    return lambda: find_fit(cost, init_guess=[0.03, 0.0, 0.0], method='Nelder-Mead')
+
+
+@workload('numeric.discount.get_dfs_cached_10k')
+def _():
+    interp = LogLinear([(x, 0.04 + 0.002 * np.log1p(x)) for x, _ in _get_curve_knots()])
+    evaluator = DiscountEvaluator(START_DATE, DayCount.ACT365, Compounding.Continuous, interp)
+    # cashflows of many trades share dates
+    flow_dates = np.array(_get_random_dates(2_000, seed=4), dtype='datetime64[D]')
+    dates = np.random.default_rng(4).choice(flow_dates, 10_000)
+    return lambda: evaluator.get_dfs(dates)
+
+
+# models
+@workload('models.data_series.get_latest_value_10y_daily_10k')
+def _():
+    series = DataSeries()
+    for i in range(10 * 365):
+        series[START_DATE + dtm.timedelta(days=i)] = 100.0 + i
+    lookups = [START_DATE + dtm.timedelta(days=i) for i in np.random.default_rng(1).integers(0, 10 * 365, 10_000).tolist()]
+    return lambda: [series.get_latest_value(d) for d in lookups]
@@ -0,0 +1,100 @@
+from collections import deque
+from typing import Iterator, Optional, TYPE_CHECKING
+import numpy as np
+
+from lib_common.app.plotter import get_scatter_type
+
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+
+
+def _iter_series(data_struct, name: str = '') -> Iterator[tuple[str, np.ndarray, np.ndarray]]:
+    # same trace naming as plotter.add_traces
+    import pandas as pd
+    if isinstance(data_struct, pd.DataFrame):
+        xvalues = data_struct.index.to_numpy()
+        for col in data_struct.columns:
+            yield name+col, xvalues, data_struct[col].to_numpy()
+    elif isinstance(data_struct, pd.Series):
+        yield name, data_struct.index.to_numpy(), data_struct.to_numpy()
+    elif isinstance(data_struct, dict):
+        for k, v in data_struct.items():
+            yield from _iter_series(v, name+k)
+    else:
+        raise TypeError("Unrecognized datatype")
+
+def _to_payload(values: np.ndarray) -> list:
+    if np.issubdtype(values.dtype, np.datetime64):
+        return np.datetime_as_string(values).tolist()
+    return values.tolist()
+
+
+class LiveFigure:
+    """Figure with stable trace ids that only sends newly appended points on refresh.
+
+    Each trace keeps a rolling window of max_points. extend returns the payload
+    for dcc.Graph extendData: (dict(x=[...], y=[...]), trace ids, max_points)."""
+
+    def __init__(self, title: str = 'Series', max_points: int = 10_000,
+                 mode: str = None, webgl_size: int = None, **layout):
+        self.max_points = max_points
+        self.mode = mode
+        self.webgl_size = webgl_size
+        self._layout = dict(title_text=title, **layout)
+        self._trace_ids: dict[str, int] = {}
+        self._xs: list[deque] = []
+        self._ys: list[deque] = []
+        self._last_xs: list = []
+        # set when traces were added after the last full figure
+        self.refresh_required = True
+
+    @property
+    def trace_names(self) -> list[str]:
+        return list(self._trace_ids)
+
+    def _get_trace_id(self, name: str) -> int:
+        ti = self._trace_ids.get(name)
+        if ti is None:
+            ti = self._trace_ids[name] = len(self._xs)
+            self._xs.append(deque(maxlen=self.max_points))
+            self._ys.append(deque(maxlen=self.max_points))
+            self._last_xs.append(None)
+            self.refresh_required = True
+        return ti
+
+    def extend(self, data) -> Optional[tuple[dict[str, list], list[int], int]]:
+        """Appends points after the last x of each trace (x values sorted ascending)."""
+        xs_update, ys_update, trace_ids = [], [], []
+        for name, xvalues, yvalues in _iter_series(data):
+            ti = self._get_trace_id(name)
+            if self._last_xs[ti] is not None:
+                start = np.searchsorted(xvalues, self._last_xs[ti], side='right')
+                xvalues, yvalues = xvalues[start:], yvalues[start:]
+            if not len(xvalues):
+                continue
+            xvalues, yvalues = xvalues[-self.max_points:], yvalues[-self.max_points:]
+            self._xs[ti].extend(xvalues)
+            self._ys[ti].extend(yvalues)
+            self._last_xs[ti] = xvalues[-1]
+            xs_update.append(_to_payload(xvalues))
+            ys_update.append(_to_payload(yvalues))
+            trace_ids.append(ti)
+        if not trace_ids:
+            return None
+        return dict(x=xs_update, y=ys_update), trace_ids, self.max_points
+
+    def get_figure(self) -> 'go.Figure':
+        """Full figure for initial load or after new traces were added."""
+        import plotly.graph_objects as go
+        fig = go.Figure()
+        for name, ti in self._trace_ids.items():
+            fig.add_trace(get_scatter_type(len(self._xs[ti]), self.webgl_size)(
+                x=np.array(self._xs[ti]),
+                y=np.array(self._ys[ti]),
+                name=name,
+                mode=self.mode,
+                uid=name,
+            ))
+        fig.update_layout(uirevision=True, **self._layout)
+        self.refresh_required = False
+        return fig
@@ -1,26 +1,115 @@
-import pandas as pd
+from typing import TYPE_CHECKING
+import numpy as np
 # import matplotlib.pyplot as plt
 # import matplotlib.dates as mdates
 # from cycler import cycler
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+
+# pandas and plotly are imported on first use to keep import time low
+if TYPE_CHECKING:
+    import pandas as pd
+
+from lib_common.numeric.interpolator import Interpolator
+
+
+def _to_numeric(xvalues: np.ndarray) -> np.ndarray:
+    import pandas as pd
+    if np.issubdtype(xvalues.dtype, np.number):
+        return xvalues.astype(float)
+    try:
+        return pd.to_datetime(xvalues).to_numpy().astype('datetime64[ns]').astype(np.int64).astype(float)
+    except (TypeError, ValueError):
+        return np.arange(len(xvalues), dtype=float)
+
+# Largest-Triangle-Three-Buckets: keeps the point forming the largest triangle
+# with the previously kept point and the average of the next bucket
+def get_lttb_ids(xvalues: np.ndarray, yvalues: np.ndarray, max_points: int) -> np.ndarray:
+    size = len(yvalues)
+    if max_points >= size or max_points < 3:
+        return np.arange(size)
+    ids = np.empty(max_points, dtype=np.int64)
+    ids[0], ids[-1] = 0, size - 1
+    bucket_size = (size - 2) / (max_points - 2)
+    ai = 0
+    for bi in range(max_points - 2):
+        start, end = int(bi * bucket_size) + 1, int((bi + 1) * bucket_size) + 1
+        next_end = min(int((bi + 2) * bucket_size) + 1, size)
+        avg_x, avg_y = xvalues[end:next_end].mean(), yvalues[end:next_end].mean()
+        areas = np.abs(
+            (xvalues[ai] - avg_x) * (yvalues[start:end] - yvalues[ai]) -
+            (xvalues[ai] - xvalues[start:end]) * (avg_y - yvalues[ai]))
+        ai = start + int(np.argmax(areas))
+        ids[bi+1] = ai
+    return ids
+
+# Keeps first minimum and maximum of each bucket
+def get_minmax_ids(yvalues: np.ndarray, max_points: int) -> np.ndarray:
+    size = len(yvalues)
+    if max_points >= size or max_points < 2:
+        return np.arange(size)
+    edges = np.linspace(0, size, max_points // 2 + 1).astype(np.int64)
+    bucket_ids = np.repeat(np.arange(len(edges) - 1), np.diff(edges))
+    ids = []
+    for reduce_f in (np.minimum, np.maximum):
+        extremes = reduce_f.reduceat(yvalues, edges[:-1])
+        matched = np.flatnonzero(yvalues == extremes[bucket_ids])
+        _, first_ids = np.unique(bucket_ids[matched], return_index=True)
+        ids.append(matched[first_ids])
+    return np.unique(np.concatenate(ids))
+
+def get_downsampled_ids(xvalues: np.ndarray, yvalues: np.ndarray,
+                        max_points: int, method: str = 'lttb') -> np.ndarray:
+    import pandas as pd
+    valid_ids = np.flatnonzero(~pd.isna(yvalues))
+    yvalues = yvalues[valid_ids].astype(float)
+    match method:
+        case 'lttb':
+            return valid_ids[get_lttb_ids(_to_numeric(xvalues[valid_ids]), yvalues, max_points)]
+        case 'minmax':
+            return valid_ids[get_minmax_ids(yvalues, max_points)]
+        case _:
+            raise ValueError(f"{method} not supported for downsampling")
+
+def _get_trace_values(xvalues, yvalues, cvalues, max_points: int, downsample: str):
+    # render mode: numpy arrays are passed through to plotly without list conversion
+    xvalues, yvalues = np.asarray(xvalues), np.asarray(yvalues)
+    cvalues = np.asarray(cvalues) if cvalues is not None else None
+    if max_points and len(yvalues) > max_points:
+        ids = get_downsampled_ids(xvalues, yvalues, max_points, downsample)
+        xvalues, yvalues = xvalues[ids], yvalues[ids]
+        cvalues = cvalues[ids] if cvalues is not None else None
+    return xvalues, yvalues, cvalues
+
+def get_scatter_type(size: int, webgl_size: int = None):
+    import plotly.graph_objects as go
+    return go.Scattergl if webgl_size is not None and size > webgl_size else go.Scatter
 
 
 def add_traces(
         figure, data_struct, text_col: str = None,
         group: str = None, mode: str = None, name: str = '',
-        showlegend: bool = True, **kwargs):
+        showlegend: bool = True,
+        max_points: int = None, webgl_size: int = None, downsample: str = 'lttb',
+        **kwargs):
+    """Adds Scatter traces for data. Opt-in render mode when max_points or webgl_size are set:
+    each series is downsampled to max_points and Scattergl is used above webgl_size points."""
+    import pandas as pd
+    render = max_points is not None or webgl_size is not None
     if isinstance(data_struct, pd.DataFrame):
-        xvalues = list(data_struct.index)
+        xvalues = data_struct.index.to_numpy() if render else list(data_struct.index)
         col_id = 0
         for col in data_struct.columns:
             if col == text_col:
                 continue
+            xs, ys = xvalues, data_struct[col]
+            cs = data_struct[text_col] if text_col else None
+            if render:
+                xs, ys, cs = _get_trace_values(xs, ys.to_numpy(), cs, max_points, downsample)
+            scatter_type = get_scatter_type(len(ys), webgl_size)
             figure.add_trace(
-                go.Scatter(
-                    x=xvalues,
-                    y=data_struct[col],
-                    customdata=data_struct[text_col],
+                scatter_type(
+                    x=xs,
+                    y=ys,
+                    customdata=cs,
                     hovertemplate = text_col+': %{customdata}<br>(%{x}, %{y})',
                     name=name+col,
                     mode=mode[col_id] if isinstance(mode, list) else mode,
@@ -29,9 +118,9 @@ def add_traces(
                     showlegend=showlegend,
                 )
                 if text_col else
-                go.Scatter(
-                    x=xvalues,
-                    y=data_struct[col],
+                scatter_type(
+                    x=xs,
+                    y=ys,
                     name=name+col,
                     mode=mode,
                     legendgroup=group,
@@ -42,10 +131,14 @@ def add_traces(
             )
             col_id += 1
     elif isinstance(data_struct, pd.Series):
+        if render:
+            xs, ys, _ = _get_trace_values(data_struct.index.to_numpy(), data_struct.to_numpy(), None, max_points, downsample)
+        else:
+            xs, ys = list(data_struct.index), list(data_struct.values)
         figure.add_trace(
-            go.Scatter(
-                x=list(data_struct.index),
-                y=list(data_struct.values),
+            get_scatter_type(len(ys), webgl_size)(
+                x=xs,
+                y=ys,
                 name=name,
                 mode=mode,
                 legendgroup=group,
@@ -58,7 +151,9 @@ def add_traces(
         for k, v in data_struct.items():
             add_traces(figure, v, group=group, mode=mode, name=name+k,
                        text_col=text_col,
-                       showlegend=showlegend, **kwargs)
+                       showlegend=showlegend,
+                       max_points=max_points, webgl_size=webgl_size, downsample=downsample,
+                       **kwargs)
     else:
         raise TypeError("Unrecognized datatype")
     # if isinstance(v, pd.DataFrame):
@@ -82,14 +177,18 @@ def get_figure(
         y_name: str = 'Y', y_format: str = None,
         y2_name: str = 'Y2', y2_format: str = None,
         text_col: str = None, mode: str = None, mode2: str = None,
-        hovermode: str = None, legend: dict = None):
+        hovermode: str = None, legend: dict = None,
+        max_points: int = None, webgl_size: int = None, downsample: str = 'lttb'):
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+    render_kwargs = dict(max_points=max_points, webgl_size=webgl_size, downsample=downsample)
     if data2 is not None:
         fig = make_subplots(specs=[[{"secondary_y": True}]])
-        add_traces(fig, data, mode=mode, text_col=text_col)
-        add_traces(fig, data2, group=y2_name, mode=mode2, text_col=text_col, secondary_y=True)
+        add_traces(fig, data, mode=mode, text_col=text_col, **render_kwargs)
+        add_traces(fig, data2, group=y2_name, mode=mode2, text_col=text_col, secondary_y=True, **render_kwargs)
     else:
         fig = go.Figure()
-        add_traces(fig, data, mode=mode, text_col=text_col)
+        add_traces(fig, data, mode=mode, text_col=text_col, **render_kwargs)
     fig.update_layout(
         title_text=title,
         xaxis=dict(
@@ -115,7 +214,9 @@ def plot_series(*args, **kwargs):
 
 def plot_series_multiple(data: dict[str, any], title: str = 'Multi plots',
                          x_name: str = 'Time', x_format: str = '%H:%M',
-                         y_name: str = 'Price', y_format: str = None) -> None:
+                         y_name: str = 'Price', y_format: str = None,
+                         max_points: int = None, webgl_size: int = None, downsample: str = 'lttb') -> None:
+    from plotly.subplots import make_subplots
     titles = list(sorted(data.keys()))
     nc = 4
     nr = (len(data)-1)//nc + 1
@@ -123,7 +224,8 @@ def plot_series_multiple(data: dict[str, any], title: str = 'Multi plots',
     fig = make_subplots(rows=nr, cols=nc, subplot_titles=titles)
     ni = 0
     for k in titles:
-        add_traces(fig, data[k], group=k, row=ni//nc+1, col=ni%nc+1)
+        add_traces(fig, data[k], group=k, row=ni//nc+1, col=ni%nc+1,
+                   max_points=max_points, webgl_size=webgl_size, downsample=downsample)
         # ax1 = axs[ni//ny, ni%ny]
         # ax1.set_title(k)
         ni += 1
@@ -140,15 +242,73 @@ def plot_series_multiple(data: dict[str, any], title: str = 'Multi plots',
     )
     fig.show()
 
+def _get_grid_bins(values: np.ndarray, max_size: int = None) -> tuple[np.ndarray, np.ndarray]:
+    grid, bin_ids = np.unique(values, return_inverse=True)
+    if max_size and len(grid) > max_size:
+        # decimate by merging neighbouring grid points, each bin represented by its first point
+        merged_ids = np.arange(len(grid)) * max_size // len(grid)
+        _, first_ids = np.unique(merged_ids, return_index=True)
+        grid, bin_ids = grid[first_ids], merged_ids[bin_ids]
+    return grid, bin_ids
+
+def _fill_grid_gaps(ys: np.ndarray, zs: np.ndarray, interpolator: str) -> None:
+    if not np.issubdtype(ys.dtype, np.number):
+        return
+    interp_type = Interpolator.from_string(interpolator)
+    for xi in range(zs.shape[1]):
+        known = ~np.isnan(zs[:, xi])
+        if known.all() or known.sum() < 2:
+            continue
+        known_ids = np.flatnonzero(known)
+        try:
+            interp = interp_type(list(zip(ys[known_ids].tolist(), zs[known_ids, xi].tolist())))
+        except AssertionError:
+            continue
+        # fill interior gaps only
+        for yi in range(known_ids[0] + 1, known_ids[-1]):
+            if not known[yi]:
+                zs[yi, xi] = interp.get_value(ys[yi])
+
+def get_surface_grid(
+        xvalues, yvalues, zvalues, max_grid: int = None,
+        interpolator: str = 'Linear') -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Pivots long-format points onto a regular grid averaging points in the same cell.
+    Grid is decimated to at most max_grid points per axis and gaps along y are interpolated."""
+    xs, x_ids = _get_grid_bins(np.asarray(xvalues), max_grid)
+    ys, y_ids = _get_grid_bins(np.asarray(yvalues), max_grid)
+    cell_ids = y_ids * len(xs) + x_ids
+    zvalues = np.asarray(zvalues, dtype=float)
+    valid = ~np.isnan(zvalues)
+    sums = np.bincount(cell_ids[valid], weights=zvalues[valid], minlength=len(xs) * len(ys))
+    counts = np.bincount(cell_ids[valid], minlength=len(xs) * len(ys))
+    with np.errstate(invalid='ignore'):
+        zs = (sums / counts).reshape(len(ys), len(xs))
+    if interpolator:
+        _fill_grid_gaps(ys, zs, interpolator)
+    return xs, ys, zs
+
 def get_figure_3d(
-        data: pd.DataFrame, title: str = 'Series 3D',
+        data: 'pd.DataFrame', title: str = 'Series 3D',
         x_id: int = 0, x_format: str = '%d-%b-%Y',
         y_id: int = 1, y_format: str = None, z_name: str = 'Value',
-        z_format: str = ',.3%', mesh_ids: list[int] = [2]):
+        z_format: str = ',.3%', mesh_ids: list[int] = [2],
+        surface: bool = False, max_grid: int = None, interpolator: str = 'Linear'):
+    """Scatter3d points with client triangulated Mesh3d for mesh_ids by default.
+    With surface, each of mesh_ids is rendered as a single gridded Surface instead."""
+    import plotly.graph_objects as go
     fig = go.Figure()
     data_cols = data.columns
+    if surface:
+        for z_id in mesh_ids:
+            xs, ys, zs = get_surface_grid(
+                data[data_cols[x_id]].to_numpy(), data[data_cols[y_id]].to_numpy(),
+                data[data_cols[z_id]].to_numpy(), max_grid=max_grid, interpolator=interpolator)
+            fig.add_trace(go.Surface(name=data_cols[z_id], x=xs, y=ys, z=zs))
+        x_ticks = xs if mesh_ids else None
+    else:
+        x_ticks = list(data[data_cols[x_id]])
     for z_id in range(len(data_cols)):
-        if z_id == x_id or z_id == y_id:
+        if surface or z_id == x_id or z_id == y_id:
             continue
         fig.add_trace(go.Scatter3d(
             name=data_cols[z_id],
@@ -170,7 +330,7 @@ def get_figure_3d(
             xaxis=dict(
                 title=data_cols[x_id],
                 tickformat=x_format,
-                tickvals=list(data[data_cols[x_id]]),
+                tickvals=x_ticks,
                 showspikes=False,
                 autorange='reversed',
             ),
@@ -1,35 +1,53 @@
 from pydantic.dataclasses import dataclass
 from typing import Optional
-from enum import StrEnum
 import datetime as dtm
-from pandas.tseries.offsets import CustomBusinessDay as CBDay
 
+from lib_common.coded_enum import CodedEnum
+from lib_common.profiler import profiled
 from .calendar import CalendarContext, CalendarID
 
-class BDayAdjustType(StrEnum):
+class BDayAdjustType(CodedEnum):
     Following = 'F'
     Preceding = 'P'
     ModifiedFollowing = 'MF'
 
+    __codes__ = {
+        'F': 0, 'P': 1, 'MF': 2,
+    }
+
+@profiled
 def get_adjusted_date(adjust_type: BDayAdjustType, date: dtm.date, calendar: CalendarID = None) -> dtm.date:
     match adjust_type:
         case BDayAdjustType.Following:
-            return (date + CBDay(0, calendar=CalendarContext().get_bdc(calendar))).date()
+            return CalendarContext().get_bdi(calendar).roll(date)
         case BDayAdjustType.Preceding:
-            bdc = CalendarContext().get_bdc(calendar)
-            return (date + CBDay(1, calendar=bdc) + CBDay(-1, calendar=bdc)).date()
+            return CalendarContext().get_bdi(calendar).roll(date, forward=False)
         case BDayAdjustType.ModifiedFollowing:
-            date_f = get_adjusted_date(BDayAdjustType.Following, date, calendar)
+            bdi = CalendarContext().get_bdi(calendar)
+            date_f = bdi.roll(date)
             # if EOM then preceding else following
             if date_f.year > date.year or (date_f.year == date.year and date_f.month > date.month):
-                return get_adjusted_date(BDayAdjustType.Preceding, date, calendar)
+                return bdi.roll(date, forward=False)
             return date_f
 
-@dataclass
+_BDAY_ADJUST_CACHE: dict[tuple, 'BDayAdjust'] = {}
+
+@dataclass(frozen=True)
 class BDayAdjust:
     _type: Optional[BDayAdjustType] = None
     _calendar: Optional[CalendarID | str] = None
 
+    @classmethod
+    def cached(cls, _type: Optional[BDayAdjustType] = None, _calendar: Optional[CalendarID | str] = None):
+        try:
+            return _BDAY_ADJUST_CACHE[(_type, _calendar)]
+        except KeyError:
+            return _BDAY_ADJUST_CACHE.setdefault((_type, _calendar), cls(_type, _calendar))
+
+    @property
+    def calendar(self) -> Optional[CalendarID | str]:
+        return self._calendar
+
     def get_date(self, date: dtm.date) -> dtm.date:
         if self._type:
             return get_adjusted_date(self._type, date, self._calendar)
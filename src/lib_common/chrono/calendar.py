@@ -1,45 +1,242 @@
-from enum import StrEnum
-from typing import Optional
-import holidays
+from typing import Iterable, Optional
+import datetime as dtm
+import os
+import threading
 import numpy as np
 
-class CalendarID(StrEnum):
+from lib_common.coded_enum import CodedEnum
+from lib_common.profiler import profiled
+
+class CalendarID(CodedEnum):
     USD = 'US'
     USEX = 'XNYS'
     USNY = 'US:NY'
     CNY = 'CN'
     HKD = 'HK'
 
+    __codes__ = {
+        'US': 0, 'XNYS': 1, 'US:NY': 2, 'CN': 3, 'HK': 4,
+    }
+
+def _busday_offset(dates, n: int, roll: str, bdc: Optional[np.busdaycalendar]):
+    if bdc is None:
+        return np.busday_offset(dates, n, roll=roll)
+    return np.busday_offset(dates, n, roll=roll, busdaycal=bdc)
+
+def _busday_count(from_dates, to_dates, bdc: Optional[np.busdaycalendar]):
+    if bdc is None:
+        return np.busday_count(from_dates, to_dates)
+    return np.busday_count(from_dates, to_dates, busdaycal=bdc)
+
+def _is_busday(dates, bdc: Optional[np.busdaycalendar]):
+    if bdc is None:
+        return np.is_busday(dates)
+    return np.is_busday(dates, busdaycal=bdc)
+
+
+class BusinessDayIndex:
+    """Dense business-day ordinals over a date range for O(1) business-day arithmetic.
+
+    Same conventions as numpy busday functions. Dates outside the range fall back to them."""
+
+    def __init__(self, start: dtm.date, end: dtm.date, bdc: Optional[np.busdaycalendar] = None):
+        self._bdc = bdc
+        self._start = start
+        self._start64 = np.datetime64(start, 'D')
+        days = np.arange(self._start64, np.datetime64(end, 'D') + 1)
+        self._size = len(days)
+        is_bday = _is_busday(days, bdc)
+        # number of business days in [start, start + i)
+        self._ordinals = np.concatenate([[0], np.cumsum(is_bday)])
+        self._bdates = days[is_bday]
+        # shared by all users of the calendar
+        self._ordinals.flags.writeable = False
+        self._bdates.flags.writeable = False
+        # python lists are faster than numpy for scalar lookups
+        self._ordinal_list: list[int] = self._ordinals.tolist()
+        self._bdate_list: list[dtm.date] = self._bdates.tolist()
+
+    @property
+    def calendar(self) -> Optional[np.busdaycalendar]:
+        return self._bdc
+
+    @property
+    def bdates(self) -> np.ndarray:
+        return self._bdates
+
+    def is_bday(self, date: dtm.date) -> bool:
+        di = (date - self._start).days
+        if 0 <= di < self._size:
+            return self._ordinal_list[di+1] > self._ordinal_list[di]
+        return bool(_is_busday(date, self._bdc))
+
+    def offset(self, date: dtm.date, n: int = 0, roll: str = 'forward') -> dtm.date:
+        di = (date - self._start).days
+        if 0 <= di < self._size:
+            bi = self._ordinal_list[di] if roll == 'forward' else self._ordinal_list[di+1] - 1
+            bi += n
+            if 0 <= bi < len(self._bdate_list):
+                return self._bdate_list[bi]
+        return _busday_offset(date, n, roll, self._bdc).item()
+
+    def roll(self, date: dtm.date, forward: bool = True) -> dtm.date:
+        return self.offset(date, 0, 'forward' if forward else 'backward')
+
+    def count(self, from_date: dtm.date, to_date: dtm.date) -> int:
+        fi, ti = (from_date - self._start).days, (to_date - self._start).days
+        # reversed range counts (to_date, from_date] as negative
+        if fi > ti:
+            fi, ti = fi + 1, ti + 1
+        if 0 <= fi <= self._size and 0 <= ti <= self._size:
+            return self._ordinal_list[ti] - self._ordinal_list[fi]
+        return int(_busday_count(from_date, to_date, self._bdc))
+
+    def is_month_end(self, date: dtm.date) -> bool:
+        """Checks if the next business day is in a later month."""
+        return self.offset(date, 1, 'backward').month != date.month
+
+    def _get_ids(self, dates: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        dis = (dates - self._start64).astype(np.int64)
+        return dis, (dis >= 0) & (dis < self._size)
+
+    def offset_array(self, dates: np.ndarray, n: int = 0, roll: str = 'forward') -> np.ndarray:
+        dates = np.asarray(dates, dtype='datetime64[D]')
+        dis, valid = self._get_ids(dates)
+        dis = np.where(valid, dis, 0)
+        bis = self._ordinals[dis] if roll == 'forward' else self._ordinals[dis+1] - 1
+        bis += n
+        valid &= (bis >= 0) & (bis < len(self._bdates))
+        res = self._bdates[np.where(valid, bis, 0)] if len(self._bdates) else dates.copy()
+        if not valid.all():
+            res[~valid] = _busday_offset(dates[~valid], n, roll, self._bdc)
+        return res
+
+    def count_array(self, from_dates: np.ndarray, to_dates: np.ndarray) -> np.ndarray:
+        from_dates = np.asarray(from_dates, dtype='datetime64[D]')
+        to_dates = np.asarray(to_dates, dtype='datetime64[D]')
+        fis, _ = self._get_ids(from_dates)
+        tis, _ = self._get_ids(to_dates)
+        reverse = fis > tis
+        fis, tis = fis + reverse, tis + reverse
+        valid = (fis >= 0) & (fis <= self._size) & (tis >= 0) & (tis <= self._size)
+        res = self._ordinals[np.where(valid, tis, 0)] - self._ordinals[np.where(valid, fis, 0)]
+        if not valid.all():
+            res[~valid] = _busday_count(from_dates[~valid], to_dates[~valid], self._bdc)
+        return res
+
+    def is_bday_array(self, dates: np.ndarray) -> np.ndarray:
+        dates = np.asarray(dates, dtype='datetime64[D]')
+        dis, valid = self._get_ids(dates)
+        dis = np.where(valid, dis, 0)
+        res = self._ordinals[dis+1] > self._ordinals[dis]
+        if not valid.all():
+            res[~valid] = _is_busday(dates[~valid], self._bdc)
+        return res
+
+    def is_month_end_array(self, dates: np.ndarray) -> np.ndarray:
+        dates = np.asarray(dates, dtype='datetime64[D]')
+        next_dates = self.offset_array(dates, 1, 'backward')
+        return next_dates.astype('datetime64[M]') != dates.astype('datetime64[M]')
+
+
 class CalendarContext(object):
+    """Process-wide business day calendars, built once per calendar on first use.
+
+    Reads are lock-free, builds are serialized. preload before forking a worker pool;
+    for spawn-based pools pass snapshot() to workers and restore it there before first use."""
     _years = range(2022, 2030)
     _bdc_map: dict[str, np.busdaycalendar] = {}
+    _bdi_map: dict[str, BusinessDayIndex] = {}
+    _lock = threading.RLock()
 
     def __new__(cls):
         if not hasattr(cls, 'instance'):
-            cls.instance = super(CalendarContext, cls).__new__(cls)
+            with cls._lock:
+                if not hasattr(cls, 'instance'):
+                    cls.instance = super(CalendarContext, cls).__new__(cls)
         return cls.instance
-        
+
+    @classmethod
+    def _reset_lock(cls) -> None:
+        # lock may be held by a thread which does not exist in the forked child
+        cls._lock = threading.RLock()
+
     def set_bdc(self, calendar: str):
-        calendar_list = calendar.split('+')
-        if len(calendar_list) > 1:
-            hols = np.concatenate([self.get_bdc(c).holidays for c in calendar_list])
-        else:
-            subcals = calendar.split(':')
-            if len(subcals) > 1:
-                assert len(subcals) == 2, f'Unrecognized {calendar}'
-                hols = list(holidays.country_holidays(subcals[0], subdiv=subcals[1], years = self._years).keys())
+        import holidays
+        with self._lock:
+            calendar_list = calendar.split('+')
+            if len(calendar_list) > 1:
+                hols = np.concatenate([self.get_bdc(c).holidays for c in calendar_list])
             else:
-                hols = list(holidays.country_holidays(subcals[0], years = self._years).keys())
-        self._bdc_map[calendar] = np.busdaycalendar(holidays=hols)
+                subcals = calendar.split(':')
+                if len(subcals) > 1:
+                    assert len(subcals) == 2, f'Unrecognized {calendar}'
+                    hols = list(holidays.country_holidays(subcals[0], subdiv=subcals[1], years = self._years).keys())
+                else:
+                    hols = list(holidays.country_holidays(subcals[0], years = self._years).keys())
+            self._bdc_map[calendar] = np.busdaycalendar(holidays=hols)
     
     def get_bdc(self, calendar: Optional[CalendarID | str]) -> Optional[np.busdaycalendar]:
         if not calendar:
             return None
         elif isinstance(calendar, CalendarID):
-            return self.get_bdc(calendar.value)
-        elif calendar not in self._bdc_map:
-            self.set_bdc(calendar)
-        return self._bdc_map[calendar]
+            calendar = calendar.value
+        try:
+            return self._bdc_map[calendar]
+        except KeyError:
+            with self._lock:
+                # built by another thread while waiting
+                if calendar not in self._bdc_map:
+                    self.set_bdc(calendar)
+            return self._bdc_map[calendar]
     
     def get_holidays(self, calendar: str) -> list:
         return self.get_bdc(calendar).holidays
+
+    def set_bdi(self, calendar: str):
+        with self._lock:
+            self._bdi_map[calendar] = BusinessDayIndex(
+                dtm.date(self._years[0], 1, 1), dtm.date(self._years[-1], 12, 31), self.get_bdc(calendar))
+
+    # Index over loaded years, weekends only if no calendar
+    @profiled
+    def get_bdi(self, calendar: Optional[CalendarID | str]) -> BusinessDayIndex:
+        if not calendar:
+            calendar = ''
+        elif isinstance(calendar, CalendarID):
+            calendar = calendar.value
+        try:
+            return self._bdi_map[calendar]
+        except KeyError:
+            with self._lock:
+                if calendar not in self._bdi_map:
+                    self.set_bdi(calendar)
+            return self._bdi_map[calendar]
+
+    def preload(self, calendars: Iterable[CalendarID | str]) -> None:
+        """Builds calendars and their business day indices, e.g. before forking workers."""
+        for calendar in calendars:
+            self.get_bdi(calendar)
+
+    def snapshot(self) -> dict[str, np.ndarray]:
+        """Returns picklable holidays of loaded calendars."""
+        with self._lock:
+            return {k: v.holidays for k, v in self._bdc_map.items()}
+
+    def restore(self, snapshot: dict[str, np.ndarray]) -> None:
+        """Loads calendars from snapshot, e.g. in a freshly spawned worker.
+
+        Loaded calendars are never replaced since tenors, caches and roll dates built from them
+        would go stale, so a snapshot with different holidays for a loaded calendar is rejected."""
+        with self._lock:
+            new_bdcs = {}
+            for calendar, hols in snapshot.items():
+                bdc = np.busdaycalendar(holidays=hols)
+                loaded = self._bdc_map.get(calendar)
+                if loaded is None:
+                    new_bdcs[calendar] = bdc
+                elif not np.array_equal(loaded.holidays, bdc.holidays):
+                    raise ValueError(f'Calendar {calendar} is already loaded with different holidays')
+            self._bdc_map.update(new_bdcs)
+
+os.register_at_fork(after_in_child=CalendarContext._reset_lock)
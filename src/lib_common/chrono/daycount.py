@@ -1,13 +1,23 @@
-from enum import StrEnum
 import datetime as dtm
 import numpy as np
 
+from lib_common.coded_enum import CodedEnum
 from .calendar import CalendarContext
 
 def is_leap(year: int) -> bool:
     return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
 
-class DayCount(StrEnum):
+def _is_leap_array(years: np.ndarray) -> np.ndarray:
+    return (years % 4 == 0) & ((years % 100 != 0) | (years % 400 == 0))
+
+def _get_ymd(dates: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    month_starts = dates.astype('datetime64[M]')
+    years = dates.astype('datetime64[Y]').astype(np.int64) + 1970
+    months = month_starts.astype(np.int64) % 12 + 1
+    days = (dates - month_starts.astype('datetime64[D]')).astype(np.int64) + 1
+    return years, months, days
+
+class DayCount(CodedEnum):
     
     ACT360 = 'ACT360'
     ACT365 = 'ACT365'
@@ -18,6 +28,11 @@ class DayCount(StrEnum):
     # ACTACTISMA = 'ACTACTISMA'
     BD252 = 'BD252'
 
+    __codes__ = {
+        'ACT360': 0, 'ACT365': 1, 'ACTACT': 2, 'ACTACTISDA': 3,
+        '30360': 4, '30E360': 5, 'BD252': 6,
+    }
+
     def get_dcf(self, from_date: dtm.date, to_date: dtm.date, calendar: str = None) -> float:
         match self:
             case DayCount.ACT360:
@@ -25,7 +40,7 @@ class DayCount(StrEnum):
             case DayCount.ACT365:
                 return (to_date-from_date).days/365.0
             case DayCount.BD252:
-                return np.busday_count(from_date, to_date, busdaycal=CalendarContext().get_bdc(calendar)) / 252.0
+                return CalendarContext().get_bdi(calendar).count(from_date, to_date) / 252.0
             case DayCount.ACTACT:
                 if (from_date.month > to_date.month) or (from_date.month == to_date.month and from_date.day > to_date.day):
                     from_date_to = dtm.date(from_date.year+1, to_date.month, to_date.day)
@@ -60,6 +75,47 @@ class DayCount(StrEnum):
             case _:
                 raise ValueError(f'{self.value} not recognized for day count fraction')
     
+    def get_dcf_array(self, from_dates: np.ndarray, to_dates: np.ndarray, calendar: str = None) -> np.ndarray:
+        from_dates, to_dates = np.broadcast_arrays(
+            np.asarray(from_dates, dtype='datetime64[D]'), np.asarray(to_dates, dtype='datetime64[D]'))
+        match self:
+            case DayCount.ACT360:
+                return (to_dates-from_dates).astype(np.int64)/360.0
+            case DayCount.ACT365:
+                return (to_dates-from_dates).astype(np.int64)/365.0
+            case DayCount.BD252:
+                return CalendarContext().get_bdi(calendar).count_array(from_dates, to_dates) / 252.0
+            case DayCount.ACTACTISDA:
+                from_years, to_years = _get_ymd(from_dates)[0], _get_ymd(to_dates)[0]
+                from_days_in_year = 365 + _is_leap_array(from_years)
+                to_days_in_year = 365 + _is_leap_array(to_years)
+                from_year_ends = (from_years - 1969).astype('datetime64[Y]').astype('datetime64[D]')
+                to_year_starts = (to_years - 1970).astype('datetime64[Y]').astype('datetime64[D]')
+                dcf_split = (from_year_ends-from_dates).astype(np.int64) / from_days_in_year \
+                    + (to_years-from_years-1) + (to_dates-to_year_starts).astype(np.int64) / to_days_in_year
+                return np.where(to_years > from_years, dcf_split, (to_dates-from_dates).astype(np.int64) / to_days_in_year)
+            case DayCount._30360 | DayCount._30E360:
+                from_years, from_months, from_days = _get_ymd(from_dates)
+                to_years, to_months, to_days = _get_ymd(to_dates)
+                if self == DayCount._30360:
+                    to_days = np.where((to_days == 31) & (from_days >= 30), 30, to_days)
+                else:
+                    to_days = np.minimum(to_days, 30)
+                from_days = np.minimum(from_days, 30)
+                return (to_years-from_years) + (to_months-from_months)/12 + (to_days-from_days)/360
+            case _:
+                return np.array([self.get_dcf(f, t, calendar) for f, t in zip(from_dates.tolist(), to_dates.tolist())], dtype=float)
+
+    @classmethod
+    def get_dcf_by_code(cls, codes: np.ndarray, from_dates: np.ndarray, to_dates: np.ndarray, calendar: str = None) -> np.ndarray:
+        """Day count fractions for rows with mixed conventions given by codes, computed per convention."""
+        from_dates, to_dates = np.broadcast_arrays(
+            np.asarray(from_dates, dtype='datetime64[D]'), np.asarray(to_dates, dtype='datetime64[D]'))
+        res = np.empty(len(codes), dtype=float)
+        for daycount, ids in cls.iter_groups(codes):
+            res[ids] = daycount.get_dcf_array(from_dates[ids], to_dates[ids], calendar)
+        return res
+
     def get_unit_dcf(self) -> float:
         match self:
             case DayCount.ACT360:
@@ -1,7 +1,8 @@
-from enum import StrEnum
 import datetime as dtm
 import numpy as np
 
+from lib_common.coded_enum import CodedEnum
+
 from .tenor import Tenor, BDayAdjust
 from .roll import RollConvention
 
@@ -14,7 +15,7 @@ _UNIT_DCF = {
     'W': 1/52.0,
 }
 
-class Frequency(StrEnum):
+class Frequency(CodedEnum):
 
     Annual = 'A'
     SemiAnnual = 'S'
@@ -22,22 +23,26 @@ class Frequency(StrEnum):
     Monthly = 'M'
     Weekly = 'W'
 
+    __codes__ = {
+        'A': 0, 'S': 1, 'Q': 2, 'M': 3, 'W': 4,
+    }
+
     def to_tenor(self, backward: bool = True) -> Tenor:
         match self.value:
             case 'A':
-                return Tenor('-1y' if backward else '1y')
+                return Tenor.cached('-1y' if backward else '1y')
             case 'S':
-                return Tenor('-6m' if backward else '6m')
+                return Tenor.cached('-6m' if backward else '6m')
             case 'Q':
-                return Tenor('-3m' if backward else '3m')
+                return Tenor.cached('-3m' if backward else '3m')
             case 'M':
-                return Tenor('-1m' if backward else '1m')
+                return Tenor.cached('-1m' if backward else '1m')
             case 'W' | '7D':
-                return Tenor('-1w' if backward else '1w')
+                return Tenor.cached('-1w' if backward else '1w')
             case '4W' | '28D':
-                return Tenor('-4w' if backward else '4w')
+                return Tenor.cached('-4w' if backward else '4w')
             case 'D' | 'B':
-                return Tenor('-1b' if backward else '1b')
+                return Tenor.cached('-1b' if backward else '1b')
             case _:
                 raise RuntimeError(f'Cannot parse frequency {self.value}')
     
@@ -60,7 +65,7 @@ class Frequency(StrEnum):
             step_backward=step_backward, bd_adjust=bd_adjust, extend_last=extend_last)
 
 
-class Compounding(StrEnum):
+class Compounding(CodedEnum):
 
     Annual = 'A'
     SemiAnnual = 'S'
@@ -70,6 +75,10 @@ class Compounding(StrEnum):
     Continuous = 'CON'
     Simple = 'SIM'
 
+    __codes__ = {
+        'A': 0, 'S': 1, 'Q': 2, 'M': 3, 'D': 4, 'CON': 5, 'SIM': 6,
+    }
+
     def get_rate(self, df: float, dcf: float, dcf_unit: float = 0) -> float:
         match self.value:
             case 'CON':
@@ -96,3 +105,19 @@ class Compounding(StrEnum):
             case _:
                 raise RuntimeError(f'Cannot parse compounding {self.value}')
 
+    @classmethod
+    def get_df_by_code(cls, codes: np.ndarray, rates: np.ndarray, dcfs: np.ndarray) -> np.ndarray:
+        """Discount factors for rows with mixed compounding given by codes, computed per compounding."""
+        rates, dcfs = np.broadcast_arrays(np.asarray(rates, dtype=float), np.asarray(dcfs, dtype=float))
+        res = np.empty(len(codes), dtype=float)
+        for compounding, ids in cls.iter_groups(codes):
+            res[ids] = compounding.get_df(rates[ids], dcfs[ids])
+        return res
+
+    @classmethod
+    def get_rate_by_code(cls, codes: np.ndarray, dfs: np.ndarray, dcfs: np.ndarray, dcf_unit: float = 0) -> np.ndarray:
+        dfs, dcfs = np.broadcast_arrays(np.asarray(dfs, dtype=float), np.asarray(dcfs, dtype=float))
+        res = np.empty(len(codes), dtype=float)
+        for compounding, ids in cls.iter_groups(codes):
+            res[ids] = compounding.get_rate(dfs[ids], dcfs[ids], dcf_unit)
+        return res
@@ -0,0 +1,162 @@
+from pydantic.dataclasses import dataclass
+from typing import ClassVar
+import datetime as dtm
+import numpy as np
+
+from .calendar import BusinessDayIndex
+from .daycount import is_leap
+
+# Native replacements for the pandas offsets used in tenor arithmetic.
+# All offsets work on dtm.date directly and on datetime64[D] arrays.
+
+_MONTH_DAYS = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+
+def get_month_days(year: int, month: int) -> int:
+    if month == 2 and is_leap(year):
+        return 29
+    return _MONTH_DAYS[month-1]
+
+def _get_month_end(month_id: int) -> dtm.date:
+    year, month = divmod(month_id, 12)
+    return dtm.date(year, month+1, get_month_days(year, month+1))
+
+def _get_month_begin(month_id: int) -> dtm.date:
+    year, month = divmod(month_id, 12)
+    return dtm.date(year, month+1, 1)
+
+def add_months(date: dtm.date, months: int) -> dtm.date:
+    """Adds months clipping the day to month end e.g. 31-Jan-2024 + 1m = 29-Feb-2024."""
+    year, month = divmod(date.year * 12 + date.month - 1 + months, 12)
+    month += 1
+    return dtm.date(year, month, min(date.day, get_month_days(year, month)))
+
+def to_date_array(dates) -> np.ndarray:
+    return np.asarray(dates, dtype='datetime64[D]')
+
+def _get_month_ids(dates: np.ndarray) -> np.ndarray:
+    return dates.astype('datetime64[M]').astype(np.int64)
+
+def _get_month_starts(month_ids: np.ndarray) -> np.ndarray:
+    return month_ids.astype('datetime64[M]').astype('datetime64[D]')
+
+def _get_month_ends(month_ids: np.ndarray) -> np.ndarray:
+    return _get_month_starts(month_ids + 1) - 1
+
+def add_months_array(dates: np.ndarray, months: int) -> np.ndarray:
+    month_ids = _get_month_ids(dates)
+    day_ids = (dates - _get_month_starts(month_ids)).astype(np.int64)
+    new_starts = _get_month_starts(month_ids + months)
+    month_days = (_get_month_ends(month_ids + months) - new_starts).astype(np.int64)
+    return new_starts + np.minimum(day_ids, month_days)
+
+
+@dataclass(frozen=True)
+class Offset:
+
+    def apply(self, date: dtm.date) -> dtm.date:
+        raise NotImplementedError("Abstract function")
+
+    def apply_array(self, dates: np.ndarray) -> np.ndarray:
+        raise NotImplementedError("Abstract function")
+
+    def __radd__(self, other):
+        if isinstance(other, np.ndarray):
+            return self.apply_array(other)
+        return self.apply(other)
+
+
+@dataclass(frozen=True)
+class DateOffset(Offset):
+    years: int = 0
+    months: int = 0
+    weeks: int = 0
+    days: int = 0
+
+    def apply(self, date: dtm.date) -> dtm.date:
+        months = self.years * 12 + self.months
+        if months:
+            date = add_months(date, months)
+        if self.weeks or self.days:
+            date += dtm.timedelta(days=self.weeks * 7 + self.days)
+        return date
+
+    def apply_array(self, dates: np.ndarray) -> np.ndarray:
+        dates = to_date_array(dates)
+        months = self.years * 12 + self.months
+        if months:
+            dates = add_months_array(dates, months)
+        return dates + (self.weeks * 7 + self.days)
+
+
+# Rolls to end of a period of `_period` months with the final month of a period being `_anchor`.
+# Same conventions as pandas anchored offsets: n=0 rolls forward if not on an end,
+# n>0 counts the rolled end as first step, n<0 steps back from the current period.
+@dataclass(frozen=True)
+class _PeriodEnd(Offset):
+    n: int = 1
+    _period: ClassVar[int] = 1
+    _anchor: ClassVar[int] = 12
+
+    def apply(self, date: dtm.date) -> dtm.date:
+        end_id = date.year * 12 + date.month - 1 + (self._anchor - date.month) % self._period
+        n = self.n
+        if n > 0 and date < _get_month_end(end_id):
+            n -= 1
+        return _get_month_end(end_id + n * self._period)
+
+    def apply_array(self, dates: np.ndarray) -> np.ndarray:
+        dates = to_date_array(dates)
+        month_ids = _get_month_ids(dates)
+        end_ids = month_ids + (self._anchor - 1 - month_ids) % self._period
+        steps = np.full(dates.shape, self.n, dtype=np.int64)
+        if self.n > 0:
+            steps -= dates < _get_month_ends(end_ids)
+        return _get_month_ends(end_ids + steps * self._period)
+
+
+@dataclass(frozen=True)
+class MonthEnd(_PeriodEnd):
+    _period: ClassVar[int] = 1
+
+@dataclass(frozen=True)
+class QuarterEnd(_PeriodEnd):
+    _period: ClassVar[int] = 3
+
+@dataclass(frozen=True)
+class YearEnd(_PeriodEnd):
+    _period: ClassVar[int] = 12
+
+
+@dataclass(frozen=True)
+class MonthBegin(Offset):
+    n: int = 1
+
+    def apply(self, date: dtm.date) -> dtm.date:
+        n = self.n
+        if n <= 0 and date.day > 1:
+            n += 1
+        return _get_month_begin(date.year * 12 + date.month - 1 + n)
+
+    def apply_array(self, dates: np.ndarray) -> np.ndarray:
+        dates = to_date_array(dates)
+        month_ids = _get_month_ids(dates)
+        steps = np.full(dates.shape, self.n, dtype=np.int64)
+        if self.n <= 0:
+            steps += dates > _get_month_starts(month_ids)
+        return _get_month_starts(month_ids + steps)
+
+
+@dataclass(frozen=True, config=dict(arbitrary_types_allowed = True))
+class BusinessDay(Offset):
+    n: int
+    index: BusinessDayIndex
+
+    # non-business days count as the first step if n > 0 (same as pandas CustomBusinessDay)
+    def _get_roll(self) -> str:
+        return 'backward' if self.n > 0 else 'forward'
+
+    def apply(self, date: dtm.date) -> dtm.date:
+        return self.index.offset(date, self.n, self._get_roll())
+
+    def apply_array(self, dates: np.ndarray) -> np.ndarray:
+        return self.index.offset_array(dates, self.n, self._get_roll())
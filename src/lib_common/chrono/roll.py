@@ -1,31 +1,143 @@
 from pydantic.dataclasses import dataclass
 from enum import StrEnum
+from functools import cache
 import datetime as dtm
-from pandas.tseries.offsets import MonthEnd
+import bisect
+import numpy as np
+
+from .calendar import CalendarContext
+from .offset import MonthEnd, to_date_array
 
 class RollConventionType(StrEnum):
     DayOfMonth = 'D'
     EndOfMonth = 'EOM'
     IMM = 'IMM'
 
+IMM_MONTHS = (3, 6, 9, 12)
+
+# IMM date is 3rd Wednesday of the month
+def get_imm_date(year: int, month: int) -> dtm.date:
+    first = dtm.date(year, month, 1)
+    return first + dtm.timedelta(days=(2 - first.weekday()) % 7 + 14)
+
+def _get_imm_dates_array(months: np.ndarray) -> np.ndarray:
+    firsts = months.astype('datetime64[M]').astype('datetime64[D]')
+    # 1970-01-01 is a Thursday
+    weekdays = (firsts.astype(np.int64) + 3) % 7
+    return firsts + (2 - weekdays) % 7 + 14
+
+class _IMMTable:
+    """Precomputed IMM dates over calendar years for bisect lookups.
+
+    Dates at or beyond the ends of the table walk months directly."""
+
+    def __init__(self, years: range, months: tuple[int, ...]):
+        self.dates = [get_imm_date(y, m) for y in years for m in months]
+        self.dates_array = np.array(self.dates, dtype='datetime64[D]')
+        self.months = months
+
+    def _get_fallback(self, date: dtm.date, step: int, inclusive: bool) -> dtm.date:
+        # walk month by month outside of the table range
+        month_id = date.year * 12 + date.month - 1
+        while True:
+            year, month = divmod(month_id, 12)
+            if month + 1 in self.months:
+                imm = get_imm_date(year, month + 1)
+                if imm == date and inclusive or (imm > date if step > 0 else imm < date):
+                    return imm
+            month_id += step
+
+    def get_next(self, date: dtm.date, inclusive: bool = True) -> dtm.date:
+        di = (bisect.bisect_left if inclusive else bisect.bisect_right)(self.dates, date)
+        if 0 < di < len(self.dates):
+            return self.dates[di]
+        return self._get_fallback(date, 1, inclusive)
+
+    def get_previous(self, date: dtm.date, inclusive: bool = True) -> dtm.date:
+        di = (bisect.bisect_right if inclusive else bisect.bisect_left)(self.dates, date)
+        if 0 < di < len(self.dates):
+            return self.dates[di-1]
+        return self._get_fallback(date, -1, inclusive)
+
+    def get_next_array(self, dates: np.ndarray, inclusive: bool = True) -> np.ndarray:
+        dates = to_date_array(dates)
+        dis = np.searchsorted(self.dates_array, dates, side='left' if inclusive else 'right')
+        res = self.dates_array[np.minimum(dis, len(self.dates) - 1)]
+        invalid = (dis == 0) | (dis == len(self.dates))
+        if invalid.any():
+            res[invalid] = [self.get_next(d, inclusive) for d in dates[invalid].tolist()]
+        return res
+
+    def get_previous_array(self, dates: np.ndarray, inclusive: bool = True) -> np.ndarray:
+        dates = to_date_array(dates)
+        dis = np.searchsorted(self.dates_array, dates, side='right' if inclusive else 'left')
+        res = self.dates_array[np.maximum(dis - 1, 0)]
+        invalid = (dis == 0) | (dis == len(self.dates))
+        if invalid.any():
+            res[invalid] = [self.get_previous(d, inclusive) for d in dates[invalid].tolist()]
+        return res
+
+@cache
+def get_imm_table(quarterly: bool = True) -> _IMMTable:
+    return _IMMTable(CalendarContext._years, IMM_MONTHS if quarterly else tuple(range(1, 13)))
+
+def get_next_imm_date(date: dtm.date, quarterly: bool = True, inclusive: bool = True) -> dtm.date:
+    return get_imm_table(quarterly).get_next(date, inclusive)
+
+def get_previous_imm_date(date: dtm.date, quarterly: bool = True, inclusive: bool = True) -> dtm.date:
+    return get_imm_table(quarterly).get_previous(date, inclusive)
+
 def get_rolled_date(roll_type: RollConventionType, date: dtm.date) -> dtm.date:
     match roll_type:
         case RollConventionType.DayOfMonth:
             return date
         case RollConventionType.EndOfMonth:
-            return (date + MonthEnd(0)).date()
+            return MonthEnd(0).apply(date)
+        case RollConventionType.IMM:
+            # IMM date of the same month
+            table = get_imm_table(quarterly=False)
+            mi = (date.year - CalendarContext._years[0]) * 12 + date.month - 1
+            if 0 <= mi < len(table.dates):
+                return table.dates[mi]
+            return get_imm_date(date.year, date.month)
+
+def get_rolled_dates(roll_type: RollConventionType, dates: np.ndarray) -> np.ndarray:
+    dates = to_date_array(dates)
+    match roll_type:
+        case RollConventionType.DayOfMonth:
+            return dates
+        case RollConventionType.EndOfMonth:
+            return MonthEnd(0).apply_array(dates)
         case RollConventionType.IMM:
-            raise NotImplementedError('IMM roll not implemented')
+            return _get_imm_dates_array(dates.astype('datetime64[M]'))
 
-@dataclass
+_ROLL_CACHE: dict[RollConventionType | None, 'RollConvention'] = {}
+
+@dataclass(frozen=True)
 class RollConvention:
     _type: RollConventionType | None = None
 
+    @classmethod
+    def cached(cls, _type: RollConventionType | None = None):
+        try:
+            return _ROLL_CACHE[_type]
+        except KeyError:
+            return _ROLL_CACHE.setdefault(_type, cls(_type))
+
     def is_eom(self):
         return self._type == RollConventionType.EndOfMonth
 
+    def is_imm(self):
+        return self._type == RollConventionType.IMM
+
     def get_date(self, date: dtm.date) -> dtm.date:
         if self._type:
             return get_rolled_date(self._type, date)
         else:
             return date
+
+    def get_dates(self, dates: np.ndarray) -> np.ndarray:
+        if self._type:
+            return get_rolled_dates(self._type, dates)
+        else:
+            return to_date_array(dates)
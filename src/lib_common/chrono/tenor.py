@@ -1,9 +1,12 @@
 from pydantic.dataclasses import dataclass
+from dataclasses import field
 import datetime as dtm
-from pandas.tseries.offsets import DateOffset, MonthEnd, QuarterEnd, YearEnd, MonthBegin, CustomBusinessDay as CBDay
+import numpy as np
 
+from lib_common.profiler import profiled
 from .calendar import CalendarContext, CalendarID
 from .badjust import BDayAdjust
+from .offset import Offset, DateOffset, MonthEnd, QuarterEnd, YearEnd, MonthBegin, BusinessDay
 from .roll import RollConvention
 
 
@@ -16,20 +19,18 @@ def parse_code(str_int: str) -> tuple[int, str]:
     return int(str_int[:ci+1]), str_int[ci+1:]
 
 def is_eom(date: dtm.date, calendar: CalendarID | str | None):
-    next_day = Tenor.bday(1, calendar).get_date_simple(date)
-    return next_day.month != date.month
+    return CalendarContext().get_bdi(calendar).is_month_end(date)
 
 def load_tenor(arg: str | tuple[str, str]):
     if isinstance(arg, tuple):
         assert len(arg) == 2, ValueError(f'Expect tuple of size 2 {arg}')
-        full_code = arg[0]
-        bdc = CalendarContext().get_bdc(arg[1])
+        full_code, calendar = arg
     else:
-        full_code, bdc = arg, None
+        full_code, calendar = arg, None
     num, code = parse_code(full_code)
     match code.lower():
         case 'b':
-            return CBDay(n=num, calendar=bdc)
+            return BusinessDay(n=num, index=CalendarContext().get_bdi(calendar))
         case 'y':
             return DateOffset(years=num)
         case 'm':
@@ -51,21 +52,35 @@ def load_tenor(arg: str | tuple[str, str]):
             raise RuntimeError(f'Cannot parse tenor {code}')
 
 
-@dataclass(config=dict(arbitrary_types_allowed = True))
+# Flyweight caches so that hot paths skip validation and parsing after first creation
+_TENOR_CACHE: dict[str | tuple[str, str], 'Tenor'] = {}
+_BDAY_CACHE: dict[tuple[int, str], 'Tenor'] = {}
+
+@dataclass(frozen=True, config=dict(arbitrary_types_allowed = True))
 class Tenor:
     code: str | tuple[str, str]
-    _offsets: list[DateOffset | CBDay] = None
+    _offsets: tuple[Offset, ...] = field(default=None, compare=False)
     
     def __post_init__(self):
         if not self._offsets:
-            self._offsets = [load_tenor(self.code)]
+            object.__setattr__(self, '_offsets', (load_tenor(self.code),))
     
     def __add__(self, new):
         return Tenor(f"{self.code}+{new.code}", self._offsets + new._offsets)
     
+    @classmethod
+    def cached(cls, code: str | tuple[str, str]):
+        try:
+            return _TENOR_CACHE[code]
+        except KeyError:
+            return _TENOR_CACHE.setdefault(code, cls(code))
+    
     @classmethod
     def bday(cls, n: int = 0, calendar: CalendarID | str = None):
-        return cls(f'{n}b', [CBDay(n=n, calendar=CalendarContext().get_bdc(calendar))])
+        try:
+            return _BDAY_CACHE[(n, calendar)]
+        except KeyError:
+            return _BDAY_CACHE.setdefault((n, calendar), cls.cached((f'{n}b', calendar) if calendar else f'{n}b'))
     
     def is_monthly(self):
         for offset in self._offsets:
@@ -73,18 +88,27 @@ class Tenor:
                 return False
         return True
     
+    @profiled
     def get_date_simple(self, date: dtm.date = None) -> dtm.date:
-        res = date
+        res = date.date() if isinstance(date, dtm.datetime) else date
+        for offset in self._offsets:
+            res = offset.apply(res)
+        return res
+    
+    def get_dates_simple(self, dates: np.ndarray) -> np.ndarray:
+        res = dates
         for offset in self._offsets:
-            res = res + offset
-        return res.date()
+            res = offset.apply_array(res)
+        return res
     
     def get_date(self, date: dtm.date = None, bd_adjust = BDayAdjust()) -> dtm.date:
         return bd_adjust.get_date(self.get_date_simple(date))
     
     def get_valid_roll(self, date: dtm.date, roll_convention: RollConvention, bd_adjust = BDayAdjust()):
         if roll_convention.is_eom() and not (self.is_monthly() and is_eom(date, bd_adjust.calendar)):
-            return RollConvention()
+            return RollConvention.cached()
+        elif roll_convention.is_imm() and not self.is_monthly():
+            return RollConvention.cached()
         return roll_convention
     
     def get_date_rolled(self, date: dtm.date, roll_convention_v: RollConvention, bd_adjust = BDayAdjust()):
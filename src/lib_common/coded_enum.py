@@ -0,0 +1,75 @@
+from enum import StrEnum
+from functools import cache
+from typing import Iterable, Iterator, Self
+import numpy as np
+
+
+@cache
+def _get_code_table(enum_cls: type) -> tuple[np.ndarray, dict[str, int], np.dtype]:
+    codes: dict[str, int] = getattr(enum_cls, '__codes__', None) or {}
+    values = {m.value for m in enum_cls}
+    if missing := values - codes.keys():
+        raise TypeError(f'{enum_cls.__name__} has no code for {sorted(missing)}')
+    if extra := codes.keys() - values:
+        raise TypeError(f'{enum_cls.__name__} has codes for unknown values {sorted(extra)}')
+    if len(set(codes.values())) != len(codes):
+        raise TypeError(f'{enum_cls.__name__} has duplicate codes')
+    if not all(isinstance(c, int) and 0 <= c <= np.iinfo(np.int16).max for c in codes.values()):
+        raise TypeError(f'{enum_cls.__name__} codes must be non-negative int16')
+    max_code = max(codes.values(), default=0)
+    dtype = np.dtype(np.int8) if max_code <= np.iinfo(np.int8).max else np.dtype(np.int16)
+    # indexed by code, None for retired codes
+    members = np.full(max_code + 1, None, dtype=object)
+    for m in enum_cls:
+        members[codes[m.value]] = m
+    # keyed by member, str values hash and compare equal to members
+    return members, {m: codes[m.value] for m in enum_cls}, dtype
+
+
+class CodedEnum(StrEnum):
+    """StrEnum with a fixed small integer code per member for columnar storage and group-wise dispatch.
+
+    Subclasses define __codes__ mapping each value to its code. Codes are stored so they
+    must never change or be reused, new members take new codes."""
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # validate the code table on definition
+        if len(cls):
+            _get_code_table(cls)
+
+    @property
+    def code(self) -> int:
+        return _get_code_table(type(self))[1][self]
+
+    @classmethod
+    def from_code(cls, code: int) -> Self:
+        members = _get_code_table(cls)[0]
+        if not 0 <= code < len(members) or members[code] is None:
+            raise ValueError(f'{code} is not a valid {cls.__name__} code')
+        return members[code]
+
+    @classmethod
+    def code_dtype(cls) -> np.dtype:
+        return _get_code_table(cls)[2]
+
+    @classmethod
+    def encode(cls, values: Iterable[Self | str]) -> np.ndarray:
+        _, codes, dtype = _get_code_table(cls)
+        try:
+            return np.fromiter((codes[v] for v in values), dtype=dtype)
+        except KeyError as ex:
+            raise ValueError(f'{ex.args[0]} is not a valid {cls.__name__}')
+
+    @classmethod
+    def decode(cls, codes: np.ndarray) -> np.ndarray:
+        """Returns object array of members, None for retired codes."""
+        return _get_code_table(cls)[0][np.asarray(codes)]
+
+    @classmethod
+    def iter_groups(cls, codes: np.ndarray) -> Iterator[tuple[Self, np.ndarray]]:
+        """Yields each member present in codes with the positions holding it."""
+        codes = np.asarray(codes)
+        members = _get_code_table(cls)[0]
+        for code in np.unique(codes):
+            yield members[code], np.flatnonzero(codes == code)
@@ -1,6 +1,6 @@
-from enum import StrEnum
+from lib_common.coded_enum import CodedEnum
 
-class Currency(StrEnum):
+class Currency(CodedEnum):
 
     USD = 'USD'
     # Europe
@@ -36,3 +36,12 @@ class Currency(StrEnum):
     BRL = 'BRL'
     CLP = 'CLP'
     COP = 'COP'
+
+    # stored codes, a currency added to any region takes the next unused code
+    __codes__ = {
+        'USD': 0, 'EUR': 1, 'GBP': 2, 'CHF': 3, 'NOK': 4, 'SEK': 5,
+        'JPY': 6, 'CAD': 7, 'AUD': 8, 'NZD': 9, 'CNY': 10, 'CNH': 11,
+        'HKD': 12, 'TWD': 13, 'KRW': 14, 'INR': 15, 'SGD': 16, 'MYR': 17,
+        'THB': 18, 'IDR': 19, 'PHP': 20, 'TRY': 21, 'ZAR': 22, 'MXN': 23,
+        'BRL': 24, 'CLP': 25, 'COP': 26,
+    }
@@ -1,34 +1,77 @@
+from functools import lru_cache
+from typing import Iterator
 import datetime as dtm
+import numpy as np
 
 from lib_common.chrono.badjust import BDayAdjustType, get_adjusted_date
-from lib_common.chrono.calendar import CalendarID
-from lib_common.chrono.tenor import Tenor
+from lib_common.chrono.calendar import CalendarContext, CalendarID
+
+# calendar days per chunk of iter_bdates
+BDATE_CHUNK_DAYS = 366
+
+def _get_bdates(calendar: CalendarID | str, from_date: dtm.date, to_date: dtm.date) -> np.ndarray:
+    bdi = CalendarContext().get_bdi(calendar)
+    from_date64, to_date64 = np.datetime64(from_date, 'D'), np.datetime64(to_date, 'D')
+    bdates = bdi.bdates
+    if len(bdates) and bdates[0] <= from_date64 and to_date64 <= bdates[-1]:
+        return bdates[np.searchsorted(bdates, from_date64):np.searchsorted(bdates, to_date64, side='right')].copy()
+    days = np.arange(from_date64, to_date64 + 1, dtype='datetime64[D]')
+    return days[bdi.is_bday_array(days)]
+
+# Return all business dates as datetime64 array
+def get_bdate_array(
+    from_date: dtm.date, to_date: dtm.date, calendar: CalendarID | str = None,
+    from_adjust = BDayAdjustType.Following, to_adjust = BDayAdjustType.Preceding,
+) -> np.ndarray:
+    from_date_adj = get_adjusted_date(from_adjust, from_date, calendar)
+    to_date_adj = get_adjusted_date(to_adjust, to_date, calendar)
+    return _get_bdates(calendar, from_date_adj, to_date_adj)
 
 # Return all business dates
 def get_bdate_series(
     from_date: dtm.date, to_date: dtm.date, calendar: CalendarID | str = None,
     from_adjust = BDayAdjustType.Following, to_adjust = BDayAdjustType.Preceding,
 ) -> list[dtm.date]:
-    from_date_adj = get_adjusted_date(from_adjust, from_date, calendar)
+    return get_bdate_array(from_date, to_date, calendar, from_adjust, to_adjust).tolist()
+
+# Yield business dates lazily, BDATE_CHUNK_DAYS calendar days at a time
+def iter_bdates(
+    from_date: dtm.date, to_date: dtm.date, calendar: CalendarID | str = None,
+    from_adjust = BDayAdjustType.Following, to_adjust = BDayAdjustType.Preceding,
+    chunk_days: int = BDATE_CHUNK_DAYS,
+) -> Iterator[dtm.date]:
+    chunk_start = get_adjusted_date(from_adjust, from_date, calendar)
     to_date_adj = get_adjusted_date(to_adjust, to_date, calendar)
-    return Tenor.bday(1, calendar=calendar).generate_series(from_date_adj, to_date_adj, inclusive=True)
+    while chunk_start <= to_date_adj:
+        chunk_end = min(chunk_start + dtm.timedelta(days=chunk_days - 1), to_date_adj)
+        yield from _get_bdates(calendar, chunk_start, chunk_end).tolist()
+        chunk_start = chunk_end + dtm.timedelta(days=1)
+
+# Only whether roll_time has passed matters so that is cached instead of roll_time
+@lru_cache(maxsize=256)
+def _get_last_business_date(calendar: CalendarID | str, date: dtm.date, before_roll: bool) -> dtm.date:
+    val_dt = get_adjusted_date(BDayAdjustType.Preceding, date, calendar=calendar)
+    if val_dt < date:
+        return val_dt
+    if before_roll:
+        return CalendarContext().get_bdi(calendar).offset(val_dt, -1)
+    return date
+
+@lru_cache(maxsize=256)
+def _get_current_business_date(calendar: CalendarID | str, date: dtm.date, past_roll: bool) -> dtm.date:
+    val_dt = get_adjusted_date(BDayAdjustType.Following, date, calendar=calendar)
+    if val_dt > date:
+        return val_dt
+    if past_roll:
+        return CalendarContext().get_bdi(calendar).offset(val_dt, 1)
+    return date
 
 # Returns last business date
 def get_last_business_date(calendar: CalendarID | str = None, roll_time: dtm.time = None) -> dtm.date:
     val_dtm = dtm.datetime.now(roll_time.tzinfo if roll_time else None)
-    val_dt = get_adjusted_date(BDayAdjustType.Preceding, val_dtm.date(), calendar=calendar)
-    if val_dt < val_dtm.date():
-        return val_dt
-    if roll_time and val_dtm.time() < roll_time:
-        return Tenor.bday(-1, calendar).get_date_simple(val_dt)
-    return val_dtm.date()
+    return _get_last_business_date(calendar, val_dtm.date(), bool(roll_time and val_dtm.time() < roll_time))
 
 # Returns current business date rolling forward on holiday
 def get_current_business_date(calendar: CalendarID | str = None, roll_time: dtm.time = None) -> dtm.date:
     val_dtm = dtm.datetime.now(roll_time.tzinfo if roll_time else None)
-    val_dt = get_adjusted_date(BDayAdjustType.Following, val_dtm.date(), calendar=calendar)
-    if val_dt > val_dtm.date():
-        return val_dt
-    if roll_time and val_dtm.time() >= roll_time:
-        return Tenor.bday(1, calendar).get_date_simple(val_dt)
-    return val_dtm.date()
+    return _get_current_business_date(calendar, val_dtm.date(), bool(roll_time and val_dtm.time() >= roll_time))
@@ -1,15 +1,108 @@
 from pydantic.dataclasses import dataclass
-from dataclasses import field
+from dataclasses import field, KW_ONLY
+from enum import StrEnum
 import datetime as dtm
-from typing import Self
+from typing import Optional, Self
+import bisect
+import numpy as np
 
+from lib_common.base_class import NameClass
+from lib_common.chrono.calendar import CalendarContext, CalendarID
 from lib_common.models.base_instrument import BaseInstrument
+from lib_common.models.data_series import DataSeries
 
 @dataclass
 class Future(BaseInstrument):
     underlying: BaseInstrument
     expiry: dtm.date
     lot_size: int = field(kw_only=True, default=1)
-    
+
     def __lt__(self, other: Self) -> bool:
         return self.expiry < other.expiry
+
+
+class ContinuousAdjustment(StrEnum):
+    NoAdjust = 'N'
+    # add price gaps at each roll to earlier contracts
+    BackAdjust = 'B'
+    # scale earlier contracts by price ratios at each roll
+    Ratio = 'R'
+
+@dataclass(config=dict(arbitrary_types_allowed = True))
+class FutureChain(NameClass):
+    contracts: list[Future]
+    _: KW_ONLY
+    # business days before expiry to roll into next contract
+    roll_offset: int = 0
+    calendar: Optional[CalendarID | str] = None
+    _roll_dates: list[dtm.date] = field(init=False, default_factory=list)
+
+    def __post_init__(self):
+        self.contracts = sorted(self.contracts)
+        if not self.calendar and self.contracts:
+            self.calendar = self.contracts[0].calendar
+        self._set_roll_dates()
+
+    def _set_roll_dates(self) -> None:
+        bdi = CalendarContext().get_bdi(self.calendar)
+        self._roll_dates = [bdi.offset(c.expiry, -self.roll_offset, 'backward') for c in self.contracts]
+
+    def add(self, future: Future) -> None:
+        bisect.insort(self.contracts, future)
+        self._set_roll_dates()
+
+    @property
+    def expiries(self) -> list[dtm.date]:
+        return [c.expiry for c in self.contracts]
+
+    @property
+    def roll_dates(self) -> list[dtm.date]:
+        return self._roll_dates
+
+    # Contract is active until its roll date (exclusive)
+    def get_active_index(self, date: dtm.date) -> int:
+        ci = bisect.bisect_right(self._roll_dates, date)
+        if ci == len(self.contracts):
+            raise IndexError(f"{date} is after the last roll date {self._roll_dates[-1]}")
+        return ci
+
+    def get_active(self, date: dtm.date) -> Future:
+        return self.contracts[self.get_active_index(date)]
+
+    def get_active_indices(self, dates: np.ndarray) -> np.ndarray:
+        """Returns index of active contract for each date, len(contracts) if none is active."""
+        return np.searchsorted(
+            np.array(self._roll_dates, dtype='datetime64[D]'),
+            np.asarray(dates, dtype='datetime64[D]'), side='right')
+
+    def get_continuous_series(self, adjustment: ContinuousAdjustment = ContinuousAdjustment.BackAdjust) -> DataSeries:
+        keys, values, segment_ids = [], [], []
+        # gap/ratio between next and current contract at the last date before each roll
+        roll_adjusts = np.zeros(len(self.contracts)) if adjustment != ContinuousAdjustment.Ratio else np.ones(len(self.contracts))
+        start = None
+        for ci, contract in enumerate(self.contracts):
+            series = contract.data
+            segment_keys = list(series.irange(start, self._roll_dates[ci], inclusive=(True, False)))
+            start = self._roll_dates[ci]
+            if not segment_keys:
+                continue
+            keys.extend(segment_keys)
+            values.extend(series[k] for k in segment_keys)
+            segment_ids.extend([ci] * len(segment_keys))
+            if ci + 1 < len(self.contracts) and adjustment != ContinuousAdjustment.NoAdjust:
+                try:
+                    next_value = self.contracts[ci+1].data.get_latest_value(segment_keys[-1])
+                except IndexError:
+                    continue
+                if adjustment == ContinuousAdjustment.Ratio:
+                    roll_adjusts[ci] = next_value / values[-1]
+                else:
+                    roll_adjusts[ci] = next_value - values[-1]
+        values, segment_ids = np.array(values, dtype=float), np.array(segment_ids, dtype=int)
+        match adjustment:
+            case ContinuousAdjustment.BackAdjust:
+                # cumulative gaps of all later rolls
+                values += np.cumsum(roll_adjusts[::-1])[::-1][segment_ids]
+            case ContinuousAdjustment.Ratio:
+                values *= np.cumprod(roll_adjusts[::-1])[::-1][segment_ids]
+        return DataSeries(zip(keys, values.tolist()))
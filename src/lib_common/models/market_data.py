@@ -1,6 +1,8 @@
 from pydantic.dataclasses import dataclass
 from enum import StrEnum, IntEnum
 
+from lib_common.coded_enum import CodedEnum
+
 
 class InstrumentDataField(StrEnum):
     NAME = 'name'
@@ -11,7 +13,7 @@ class InstrumentDataField(StrEnum):
     LOT_SIZE = 'lotsize'
     TICK_SIZE = 'ticksize'
 
-class MarketDataType(StrEnum):
+class MarketDataType(CodedEnum):
     LAST = 'last'
     HIGH = 'high'
     LOW = 'low'
@@ -29,6 +31,12 @@ class MarketDataType(StrEnum):
     
     UPDATE_TIME = 'update_time'
 
+    __codes__ = {
+        'last': 0, 'high': 1, 'low': 2, 'ask': 3, 'bid': 4,
+        'volume': 5, 'mid': 6, 'spread': 7, 'settle': 8, 'close': 9,
+        'open': 10, 'prev_close': 11, 'prev_oi': 12, 'update_time': 13,
+    }
+
 class OptionDataFlag(StrEnum):
     CALL = 'c'
     PUT = 'p'
@@ -0,0 +1,144 @@
+from collections import deque
+from typing import Callable, Iterable
+import datetime as dtm
+import threading
+import time
+import logging
+import numpy as np
+
+from lib_common.models.market_data import InstrumentDataModel, MarketDataType, SessionType
+
+logger = logging.Logger(__name__)
+
+FeedKey = tuple[str, SessionType]
+# callback(instrument, session, changed fields, model after update)
+Subscriber = Callable[[str, SessionType, frozenset[MarketDataType], InstrumentDataModel], None]
+
+
+class TickConflator:
+    """Collects raw quote updates and delivers only the latest value per field per interval.
+
+    Pending updates are bounded by the number of distinct (instrument, session) keys.
+    A flush is forced when `max_pending` keys are waiting.
+    Flushes are serialized so an older batch never overwrites a newer one. A flush
+    from within a subscriber callback is deferred to the next flush."""
+
+    def __init__(self, interval: float = 0.1, max_pending: int = 100_000, latency_window: int = 10_000):
+        self.interval = interval
+        self.max_pending = max_pending
+        self._models: dict[FeedKey, InstrumentDataModel] = {}
+        self._pending: dict[FeedKey, dict[MarketDataType, any]] = {}
+        # arrival time of oldest pending tick for each key
+        self._arrivals: dict[FeedKey, float] = {}
+        self._subscribers: list[Subscriber] = []
+        self._lock = threading.Lock()
+        # held across applying a batch and notifying subscribers
+        self._flush_lock = threading.RLock()
+        self._flushing = False
+        self._last_flush = time.perf_counter()
+        self._latencies = deque(maxlen=latency_window)
+        self.received = 0
+        self.delivered = 0
+
+    def subscribe(self, callback: Subscriber) -> None:
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Subscriber) -> None:
+        self._subscribers.remove(callback)
+
+    def get_model(self, instrument: str, session: SessionType = SessionType.REGULAR) -> InstrumentDataModel:
+        return self._models[(instrument, session)]
+
+    @property
+    def pending_size(self) -> int:
+        return len(self._pending)
+
+    def push(self, instrument: str, data_type: MarketDataType, value,
+             session: SessionType = SessionType.REGULAR) -> None:
+        self.push_many([(instrument, session, {data_type: value})])
+
+    def push_many(self, updates: Iterable[tuple[str, SessionType, dict[MarketDataType, any]]]) -> None:
+        arrival = time.perf_counter()
+        with self._lock:
+            for instrument, session, fields in updates:
+                key = (instrument, session)
+                pending = self._pending.get(key)
+                if pending is None:
+                    self._pending[key] = dict(fields)
+                    self._arrivals[key] = arrival
+                else:
+                    # conflate: later values overwrite earlier ones within the interval
+                    pending.update(fields)
+                self.received += len(fields)
+            overflow = len(self._pending) >= self.max_pending
+        if overflow:
+            logger.warning(f'Pending updates reached {self.max_pending} keys, flushing early')
+            self.flush()
+
+    def poll(self) -> int:
+        """Flushes if the conflation interval has elapsed. Returns number of notifications."""
+        with self._flush_lock:
+            if time.perf_counter() - self._last_flush < self.interval:
+                return 0
+            return self._flush()
+
+    def flush(self, update_time: dtm.datetime = None) -> int:
+        with self._flush_lock:
+            return self._flush(update_time)
+
+    def _flush(self, update_time: dtm.datetime = None) -> int:
+        if self._flushing:
+            return 0
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            arrivals, self._arrivals = self._arrivals, {}
+        self._last_flush = time.perf_counter()
+        if not pending:
+            return 0
+        self._flushing = True
+        try:
+            return self._apply(pending, arrivals, update_time)
+        finally:
+            self._flushing = False
+
+    def _apply(self, pending: dict[FeedKey, dict[MarketDataType, any]], arrivals: dict[FeedKey, float],
+               update_time: dtm.datetime = None) -> int:
+        update_time = update_time or dtm.datetime.now()
+        # apply the whole batch before notifying so a failing subscriber cannot drop updates
+        notifications = []
+        for key, fields in pending.items():
+            model = self._models.get(key)
+            if model is None:
+                model = self._models[key] = InstrumentDataModel()
+            changed = []
+            for data_type, value in fields.items():
+                if dict.get(model, data_type) != value:
+                    dict.__setitem__(model, data_type, value)
+                    changed.append(data_type)
+            if not changed:
+                continue
+            if MarketDataType.UPDATE_TIME not in fields:
+                dict.__setitem__(model, MarketDataType.UPDATE_TIME, update_time)
+            notifications.append((key, frozenset(changed), model))
+        for key, changed, model in notifications:
+            for callback in self._subscribers:
+                try:
+                    callback(key[0], key[1], changed, model)
+                except Exception:
+                    logger.exception(f'Subscriber {callback} failed for {key}')
+            self._latencies.append(time.perf_counter() - arrivals[key])
+            self.delivered += len(changed)
+        return len(notifications)
+
+    def get_latency_stats(self) -> dict[str, float]:
+        """End-to-end latency in seconds from first pending tick to subscriber delivery."""
+        if not self._latencies:
+            return {}
+        lats = np.fromiter(self._latencies, dtype=float)
+        return {
+            'count': len(lats),
+            'mean': float(lats.mean()),
+            'p50': float(np.percentile(lats, 50)),
+            'p99': float(np.percentile(lats, 99)),
+            'max': float(lats.max()),
+        }
@@ -0,0 +1,229 @@
+from collections.abc import MutableMapping
+from typing import Iterable, Iterator
+import math
+import numpy as np
+
+from lib_common.models.market_data import InstrumentDataField, InstrumentDataModel, MarketDataType
+
+# Derived from BID/ASK and never stored
+_DERIVED_TYPES = (MarketDataType.MID, MarketDataType.SPREAD)
+# Numeric fields stored as float columns, UPDATE_TIME is kept as objects (datetime)
+_COLUMN_TYPES = tuple(dt for dt in MarketDataType if dt not in _DERIVED_TYPES and dt != MarketDataType.UPDATE_TIME)
+_COLUMN_INDEX = {dt: ci for ci, dt in enumerate(_COLUMN_TYPES)}
+_BID_ID = _COLUMN_INDEX[MarketDataType.BID]
+_ASK_ID = _COLUMN_INDEX[MarketDataType.ASK]
+# Counts read back as int like values set on InstrumentDataModel
+_INT_TYPES = frozenset((MarketDataType.VOLUME, MarketDataType.PREV_OI))
+
+_INIT_CAPACITY = 64
+
+
+def _get_quote_mask(bid: np.ndarray, ask: np.ndarray) -> np.ndarray:
+    # same as truthiness check in InstrumentDataModel: missing or zero quotes are invalid
+    return ~np.isnan(bid) & ~np.isnan(ask) & (bid != 0) & (ask != 0)
+
+
+class MarketDataSnapshot:
+    """Columnar store of market data indexed by instrument and MarketDataType."""
+
+    def __init__(self, instruments: Iterable[str] = (), capacity: int = _INIT_CAPACITY):
+        self._index: dict[str, int] = {}
+        self._names: list[str] = []
+        self._values = np.full((max(capacity, 1), len(_COLUMN_TYPES)), np.nan)
+        self._update_times = np.full(max(capacity, 1), None, dtype=object)
+        self._static: list[dict] = []
+        self.add_instruments(instruments)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, instrument: str) -> bool:
+        return instrument in self._index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __getitem__(self, instrument: str) -> 'InstrumentSnapshotView':
+        return InstrumentSnapshotView(self, self._index[instrument])
+
+    @property
+    def instruments(self) -> list[str]:
+        return self._names
+
+    def _reserve(self, size: int) -> None:
+        capacity = self._values.shape[0]
+        if size <= capacity:
+            return
+        while capacity < size:
+            capacity *= 2
+        values = np.full((capacity, len(_COLUMN_TYPES)), np.nan)
+        values[:len(self._names)] = self._values[:len(self._names)]
+        update_times = np.full(capacity, None, dtype=object)
+        update_times[:len(self._names)] = self._update_times[:len(self._names)]
+        self._values, self._update_times = values, update_times
+
+    def add_instruments(self, instruments: Iterable[str]) -> None:
+        new_names = [k for k in dict.fromkeys(instruments) if k not in self._index]
+        self._reserve(len(self._names) + len(new_names))
+        for name in new_names:
+            self._index[name] = len(self._names)
+            self._names.append(name)
+            self._static.append({})
+
+    def get_row(self, instrument: str) -> int:
+        try:
+            return self._index[instrument]
+        except KeyError:
+            self.add_instruments([instrument])
+            return self._index[instrument]
+
+    def set_value(self, instrument: str, data_type: InstrumentDataField | MarketDataType, value) -> None:
+        self._set_value(self.get_row(instrument), data_type, value)
+
+    def _set_value(self, row: int, data_type: InstrumentDataField | MarketDataType, value) -> None:
+        if data_type in _COLUMN_INDEX:
+            self._values[row, _COLUMN_INDEX[data_type]] = np.nan if value is None else value
+        elif data_type == MarketDataType.UPDATE_TIME:
+            self._update_times[row] = value
+        elif data_type in _DERIVED_TYPES:
+            raise KeyError(f'{data_type} is derived and cannot be set')
+        else:
+            self._static[row][data_type] = value
+
+    def _del_value(self, row: int, data_type: InstrumentDataField | MarketDataType) -> None:
+        if data_type in _COLUMN_INDEX:
+            ci = _COLUMN_INDEX[data_type]
+            if math.isnan(self._values.item(row, ci)):
+                raise KeyError(data_type)
+            self._values[row, ci] = np.nan
+        elif data_type == MarketDataType.UPDATE_TIME:
+            if self._update_times[row] is None:
+                raise KeyError(data_type)
+            self._update_times[row] = None
+        else:
+            del self._static[row][data_type]
+
+    def update(self, instrument: str, data: dict) -> None:
+        row = self.get_row(instrument)
+        for data_type, value in data.items():
+            self._set_value(row, data_type, value)
+
+    def set_column(self, data_type: MarketDataType, instruments: Iterable[str], values) -> None:
+        """Sets one field for many instruments at once."""
+        rows = np.fromiter((self.get_row(k) for k in instruments), dtype=np.intp)
+        self._values[rows, _COLUMN_INDEX[data_type]] = values
+
+    def get_column(self, data_type: MarketDataType) -> np.ndarray:
+        """Returns values of a field across all instruments, NaN where missing."""
+        size = len(self._names)
+        match data_type:
+            case MarketDataType.MID:
+                bid, ask = self._values[:size, _BID_ID], self._values[:size, _ASK_ID]
+                return np.where(_get_quote_mask(bid, ask), (bid + ask) / 2, np.nan)
+            case MarketDataType.SPREAD:
+                bid, ask = self._values[:size, _BID_ID], self._values[:size, _ASK_ID]
+                return np.where(_get_quote_mask(bid, ask), ask - bid, np.nan)
+            case MarketDataType.UPDATE_TIME:
+                return self._update_times[:size].copy()
+            case _:
+                return self._values[:size, _COLUMN_INDEX[data_type]].copy()
+
+    def get_columns(self, data_types: Iterable[MarketDataType]) -> dict[MarketDataType, np.ndarray]:
+        return {dt: self.get_column(dt) for dt in data_types}
+
+    def get_value(self, instrument: str, data_type: InstrumentDataField | MarketDataType):
+        return self._get_value(self._index[instrument], data_type)
+
+    # scalar path works on python floats, numpy scalar ops are slower than a dict lookup
+    def _get_value(self, row: int, data_type: InstrumentDataField | MarketDataType):
+        ci = _COLUMN_INDEX.get(data_type)
+        if ci is not None:
+            value = self._values.item(row, ci)
+            if math.isnan(value):
+                raise KeyError(data_type)
+            return int(value) if data_type in _INT_TYPES else value
+        elif data_type in _DERIVED_TYPES:
+            # same as InstrumentDataModel: KeyError if a quote is missing, None if it is zero
+            bid = self._values.item(row, _BID_ID)
+            if math.isnan(bid):
+                raise KeyError(MarketDataType.BID)
+            if not bid:
+                return None
+            ask = self._values.item(row, _ASK_ID)
+            if math.isnan(ask):
+                raise KeyError(MarketDataType.ASK)
+            if not ask:
+                return None
+            return (bid + ask) / 2 if data_type == MarketDataType.MID else ask - bid
+        elif data_type == MarketDataType.UPDATE_TIME:
+            value = self._update_times[row]
+            if value is None:
+                raise KeyError(data_type)
+            return value
+        return self._static[row][data_type]
+
+    def _has_value(self, row: int, data_type) -> bool:
+        ci = _COLUMN_INDEX.get(data_type)
+        if ci is not None:
+            return not math.isnan(self._values.item(row, ci))
+        elif data_type == MarketDataType.UPDATE_TIME:
+            return self._update_times[row] is not None
+        return data_type in self._static[row]
+
+    def _get_keys(self, row: int) -> list:
+        keys = [dt for dt, value in zip(_COLUMN_TYPES, self._values[row].tolist()) if not math.isnan(value)]
+        if self._update_times[row] is not None:
+            keys.append(MarketDataType.UPDATE_TIME)
+        keys.extend(self._static[row])
+        return keys
+
+    def to_model(self, instrument: str) -> InstrumentDataModel:
+        row = self._index[instrument]
+        model = InstrumentDataModel()
+        model.update((k, self._get_value(row, k)) for k in self._get_keys(row))
+        return model
+
+    @classmethod
+    def from_models(cls, models: dict[str, dict]) -> 'MarketDataSnapshot':
+        snapshot = cls(models.keys(), capacity=len(models))
+        for name, model in models.items():
+            snapshot.update(name, model)
+        return snapshot
+
+
+class InstrumentSnapshotView(MutableMapping):
+    """Dict-compatible view of one instrument row in MarketDataSnapshot.
+
+    As with InstrumentDataModel, MID and SPREAD are derived on item access and are not keys.
+    Unlike it, get(MID) derives the value instead of returning None."""
+
+    __slots__ = ('_snapshot', '_row')
+
+    def __init__(self, snapshot: MarketDataSnapshot, row: int):
+        self._snapshot = snapshot
+        self._row = row
+
+    @property
+    def name(self) -> str:
+        return self._snapshot._names[self._row]
+
+    def __getitem__(self, data_type: InstrumentDataField | MarketDataType):
+        return self._snapshot._get_value(self._row, data_type)
+
+    def __setitem__(self, data_type: InstrumentDataField | MarketDataType, value) -> None:
+        self._snapshot._set_value(self._row, data_type, value)
+
+    def __delitem__(self, data_type: InstrumentDataField | MarketDataType) -> None:
+        self._snapshot._del_value(self._row, data_type)
+
+    def __contains__(self, data_type) -> bool:
+        return self._snapshot._has_value(self._row, data_type)
+
+    def __iter__(self) -> Iterator:
+        return iter(self._snapshot._get_keys(self._row))
+
+    def __len__(self) -> int:
+        return len(self._snapshot._get_keys(self._row))
+
+    def __repr__(self) -> str:
+        return f'{self.__class__.__name__}({self.name}: {dict(self.items())})'
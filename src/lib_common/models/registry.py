@@ -0,0 +1,84 @@
+from typing import Iterable, Optional
+from weakref import WeakValueDictionary
+import threading
+
+from lib_common.models.base_instrument import BaseInstrument
+from lib_common.models.data_series import DataSeries
+
+class InstrumentRegistry(object):
+    """Process-wide interning of instruments by name with one DataSeries per data_id.
+
+    Entries are weak references so instruments no longer used elsewhere are released."""
+    _lock = threading.RLock()
+    _instruments: WeakValueDictionary[str, BaseInstrument] = WeakValueDictionary()
+    _data_series: WeakValueDictionary[str, DataSeries] = WeakValueDictionary()
+
+    def __new__(cls):
+        if not hasattr(cls, 'instance'):
+            cls.instance = super(InstrumentRegistry, cls).__new__(cls)
+        return cls.instance
+
+    def __len__(self) -> int:
+        return len(self._instruments)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._instruments
+
+    @staticmethod
+    def _get_key(instrument: BaseInstrument) -> str:
+        key = instrument.name or instrument.data_id
+        if not key:
+            raise ValueError(f'Cannot register instrument without name or data_id {instrument}')
+        return key
+
+    def _share_data(self, instrument: BaseInstrument) -> None:
+        if not instrument.data_id:
+            return
+        series = self._data_series.get(instrument.data_id)
+        if series is None:
+            self._data_series[instrument.data_id] = instrument._data_series
+        elif series is not instrument._data_series:
+            series.update(instrument._data_series)
+            instrument._data_series = series
+
+    def _register(self, instrument: BaseInstrument) -> BaseInstrument:
+        key = self._get_key(instrument)
+        existing = self._instruments.get(key)
+        if existing is not None:
+            return existing
+        self._instruments[key] = instrument
+        self._share_data(instrument)
+        return instrument
+
+    def register(self, instrument: BaseInstrument) -> BaseInstrument:
+        """Returns the registered instrument with the same key if present, else registers this one."""
+        with self._lock:
+            return self._register(instrument)
+
+    def register_many(self, instruments: Iterable[BaseInstrument]) -> list[BaseInstrument]:
+        with self._lock:
+            return [self._register(ins) for ins in instruments]
+
+    def get(self, key: str) -> Optional[BaseInstrument]:
+        return self._instruments.get(key)
+
+    def get_many(self, keys: Iterable[str]) -> list[Optional[BaseInstrument]]:
+        instruments = self._instruments
+        return [instruments.get(k) for k in keys]
+
+    def get_data_series(self, data_id: str) -> DataSeries:
+        """Returns the shared series for data_id, creating one if none is referenced."""
+        with self._lock:
+            series = self._data_series.get(data_id)
+            if series is None:
+                series = self._data_series[data_id] = DataSeries()
+            return series
+
+    def unregister(self, key: str) -> None:
+        with self._lock:
+            self._instruments.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._instruments.clear()
+            self._data_series.clear()
@@ -0,0 +1,59 @@
+from typing import Iterable, Mapping, Optional
+import datetime as dtm
+
+from lib_common import sql
+from lib_common.models.data_series import DataSeries
+
+class DataSeriesStore:
+    """SQLite storage of date-indexed DataSeries by data_id.
+
+    The table is clustered on its (data_id, date) primary key (WITHOUT ROWID) so the key is
+    the covering index and reading a date range of one data_id is a single index range scan.
+    Dates are stored as ISO strings, which sort chronologically."""
+
+    def __init__(self, filename: str, table: str = 'data_series'):
+        self.filename = filename
+        self.table = table
+        sql.modify(f"""CREATE TABLE IF NOT EXISTS {table} (
+            data_id TEXT NOT NULL, date TEXT NOT NULL, value REAL,
+            PRIMARY KEY (data_id, date)) WITHOUT ROWID""", filename)
+
+    @staticmethod
+    def _get_range_filter(from_date: Optional[dtm.date], to_date: Optional[dtm.date]) -> tuple[str, list[str]]:
+        clause, params = '', []
+        if from_date:
+            clause += ' AND date >= ?'
+            params.append(from_date.isoformat())
+        if to_date:
+            clause += ' AND date <= ?'
+            params.append(to_date.isoformat())
+        return clause, params
+
+    def save(self, data_id: str, series: DataSeries) -> int:
+        """Inserts or replaces all points of series, returns number of rows written."""
+        return self.save_many({data_id: series})
+
+    def save_many(self, series_map: Mapping[str, DataSeries]) -> int:
+        rows = ((data_id, date.isoformat(), value)
+                for data_id, series in series_map.items() for date, value in series.items())
+        return sql.modify_many(
+            f'INSERT OR REPLACE INTO {self.table} (data_id, date, value) VALUES (?, ?, ?)', self.filename, rows)
+
+    def load(self, data_id: str, from_date: dtm.date = None, to_date: dtm.date = None) -> DataSeries:
+        """Returns points of data_id between from_date and to_date (inclusive)."""
+        clause, params = self._get_range_filter(from_date, to_date)
+        rows = sql.fetch(
+            f'SELECT date, value FROM {self.table} WHERE data_id = ?{clause} ORDER BY date',
+            self.filename, params=[data_id, *params])
+        return DataSeries((dtm.date.fromisoformat(date), value) for date, value in rows)
+
+    def load_many(self, data_ids: Iterable[str], from_date: dtm.date = None, to_date: dtm.date = None) -> dict[str, DataSeries]:
+        return {data_id: self.load(data_id, from_date, to_date) for data_id in data_ids}
+
+    def delete(self, data_id: str, from_date: dtm.date = None, to_date: dtm.date = None) -> int:
+        clause, params = self._get_range_filter(from_date, to_date)
+        return sql.modify_many(
+            f'DELETE FROM {self.table} WHERE data_id = ?{clause}', self.filename, [(data_id, *params)])
+
+    def get_data_ids(self) -> list[str]:
+        return [row[0] for row in sql.fetch(f'SELECT DISTINCT data_id FROM {self.table}', self.filename)]
@@ -0,0 +1,92 @@
+from collections import OrderedDict
+from typing import Iterable, Optional
+import datetime as dtm
+import numpy as np
+
+from lib_common.chrono.calendar import CalendarID
+from lib_common.chrono.daycount import DayCount
+from lib_common.chrono.frequency import Compounding
+from lib_common.numeric.interpolator import Interpolator
+
+class DiscountEvaluator:
+    """Discount factors and forward rates for dates from an interpolated curve.
+
+    Interpolator x values are day count fractions from ref_date and y values zero rates
+    with the given compounding, or discount factors if compounding is None.
+    Discount factors are memoized per date (LRU bounded by max_size) until the
+    interpolator knots change."""
+
+    def __init__(self, ref_date: dtm.date, daycount: DayCount, compounding: Optional[Compounding],
+                 interpolator: Interpolator, calendar: Optional[CalendarID | str] = None, max_size: int = 4096):
+        self.ref_date = ref_date
+        self.daycount = daycount
+        self.compounding = compounding
+        self.interpolator = interpolator
+        self.calendar = calendar
+        self.max_size = max_size
+        self._memo: OrderedDict[dtm.date, float] = OrderedDict()
+        self._knots = None
+
+    def _check_knots(self) -> None:
+        # Interpolator.update replaces the knot sequences
+        knots = (self.interpolator._xs, self.interpolator._ys)
+        if self._knots is None or knots[0] is not self._knots[0] or knots[1] is not self._knots[1]:
+            self._memo.clear()
+            self._knots = knots
+
+    def clear(self) -> None:
+        self._memo.clear()
+
+    def _get_dfs(self, dcfs: np.ndarray) -> np.ndarray:
+        values = np.array([self.interpolator.get_value(x) for x in dcfs.tolist()], dtype=float)
+        if self.compounding is None:
+            return values
+        return self.compounding.get_df(values, dcfs)
+
+    def _memoize(self, date: dtm.date, df: float) -> None:
+        self._memo[date] = df
+        if len(self._memo) > self.max_size:
+            self._memo.popitem(last=False)
+
+    def get_df(self, date: dtm.date) -> float:
+        self._check_knots()
+        try:
+            self._memo.move_to_end(date)
+            return self._memo[date]
+        except KeyError:
+            pass
+        dcf = self.daycount.get_dcf(self.ref_date, date, self.calendar)
+        df = float(self._get_dfs(np.array([dcf]))[0])
+        self._memoize(date, df)
+        return df
+
+    def get_dfs(self, dates: Iterable[dtm.date] | np.ndarray) -> np.ndarray:
+        self._check_knots()
+        dates = np.asarray(dates, dtype='datetime64[D]').tolist()
+        res = np.empty(len(dates), dtype=float)
+        missing: dict[dtm.date, list[int]] = {}
+        for di, date in enumerate(dates):
+            df = self._memo.get(date)
+            if df is None:
+                missing.setdefault(date, []).append(di)
+            else:
+                self._memo.move_to_end(date)
+                res[di] = df
+        if missing:
+            missing_dates = list(missing)
+            dcfs = self.daycount.get_dcf_array(self.ref_date, missing_dates, self.calendar)
+            for date, df in zip(missing_dates, self._get_dfs(dcfs).tolist()):
+                res[missing[date]] = df
+                self._memoize(date, df)
+        return res
+
+    def get_forward_rate(self, from_date: dtm.date, to_date: dtm.date, compounding: Compounding = None) -> float:
+        """Rate over [from_date, to_date] with compounding (default curve compounding, else Simple)."""
+        compounding = compounding or self.compounding or Compounding.Simple
+        dcf = self.daycount.get_dcf(from_date, to_date, self.calendar)
+        return compounding.get_rate(self.get_df(to_date) / self.get_df(from_date), dcf)
+
+    def get_forward_rates(self, from_dates: np.ndarray, to_dates: np.ndarray, compounding: Compounding = None) -> np.ndarray:
+        compounding = compounding or self.compounding or Compounding.Simple
+        dcfs = self.daycount.get_dcf_array(from_dates, to_dates, self.calendar)
+        return compounding.get_rate(self.get_dfs(to_dates) / self.get_dfs(from_dates), dcfs)
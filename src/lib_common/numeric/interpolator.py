@@ -1,9 +1,10 @@
 from pydantic.dataclasses import dataclass
 from dataclasses import InitVar, field
 import numpy as np
-from scipy import interpolate
 import bisect
 
+from lib_common.profiler import profiled
+
 
 @dataclass
 class Interpolator:
@@ -29,6 +30,8 @@ class Interpolator:
             return LogCubicSplineNatural
         elif name == 'Step':
             return Step
+        elif name == 'Linear':
+            return Linear
         elif name == 'LogLinear':
             return LogLinear
         elif name == 'LogBSpline':
@@ -47,6 +50,7 @@ class Interpolator:
 @dataclass
 class Step(Interpolator):
 
+    @profiled
     def get_value(self, x: float) -> float:
         super()._get_value(x)
         ih = bisect.bisect(self._xs, x)
@@ -55,8 +59,13 @@ class Step(Interpolator):
 
 @dataclass
 class Linear(Interpolator):
-    
+
+    @profiled
     def get_value(self, x: float) -> float:
+        return self._get_linear_value(x)
+
+    # unprofiled for LogLinear so each call is recorded once
+    def _get_linear_value(self, x: float) -> float:
         super()._get_value(x)
 
         if x > self._xs[-1]:
@@ -76,8 +85,9 @@ class LogLinear(Linear):
         xly_init = [(x, np.log(y)) for x, y in xy_init]
         super().__post_init__(xly_init)
     
+    @profiled
     def get_value(self, x: float) -> float:
-        return np.exp(super().get_value(x))
+        return np.exp(self._get_linear_value(x))
 
 
 # Cubic spline with free ends
@@ -87,11 +97,15 @@ class BSpline(Interpolator):
     def __post_init__(self, xy_init):
         super().__post_init__(xy_init)
         assert len(self._ys) > 3, 'require more than 3 coordinates for B-spline'
+        from scipy import interpolate
         self.spline_tck = interpolate.splrep(self._xs, self._ys)
+        # keep scipy lookup out of get_value
+        self._splev = interpolate.splev
 
+    @profiled
     def get_value(self, x: float) -> float:
         super()._get_value(x)
-        return interpolate.splev(x, self.spline_tck)
+        return self._splev(x, self.spline_tck)
 
 @dataclass
 class LogBSpline(Interpolator):
@@ -100,6 +114,7 @@ class LogBSpline(Interpolator):
         xly_init = [(x, np.log(y)) for x, y in xy_init]
         super().__post_init__(xly_init)
 
+    @profiled
     def get_value(self, x: float) -> float:
         return np.exp(super().get_value(x))
 
@@ -110,13 +125,20 @@ class CubicSplineNatural(Interpolator):
     def __post_init__(self, xy_init):
         super().__post_init__(xy_init)
         assert len(xy_init) > 3, 'require more than 3 coordinates for spline'
+        from scipy import interpolate
         self.spline_tck = interpolate.make_interp_spline(
                             self._xs, self._ys,
                             bc_type=([(2, 0.0)], [(2, 0.0)]))
+        self._splev = interpolate.splev
 
+    @profiled
     def get_value(self, x: float) -> float:
+        return self._get_spline_value(x)
+
+    # unprofiled for LogCubicSplineNatural so each call is recorded once
+    def _get_spline_value(self, x: float) -> float:
         super()._get_value(x)
-        return interpolate.splev(x, self.spline_tck)
+        return self._splev(x, self.spline_tck)
 
 # Standard for curve construction
 @dataclass
@@ -126,6 +148,7 @@ class LogCubicSplineNatural(CubicSplineNatural):
         xly_init = [(x, np.log(y)) for x, y in xy_init]
         super().__post_init__(xly_init)
 
+    @profiled
     def get_value(self, x: float) -> float:
-        return np.exp(super().get_value(x))
+        return np.exp(self._get_spline_value(x))
 
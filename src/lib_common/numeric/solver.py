@@ -1,4 +1,3 @@
-from scipy import optimize
 import logging
 import time
 
@@ -11,6 +10,7 @@ def find_root(
     error_f, args: tuple = (),
     bracket: tuple[float, float] = None, init_guess: float = None, f_prime = None
 ) -> float:
+    from scipy import optimize
     if f_prime:
         solver = optimize.root_scalar(
                 f=error_f,
@@ -45,6 +45,7 @@ def find_fit(cost_f, init_guess: list[float],
              args: tuple[any] = (), method: str = None,
              jacobian=None,
              bounds=None, **kwargs) -> list[float]:
+    from scipy import optimize
     start = time.time()
     if method is None and jacobian is None and bounds:
         method='Nelder-Mead'
@@ -0,0 +1,149 @@
+"""In-process call counts and latencies for hot-path functions.
+
+Enable with LIB_COMMON_PROFILE=1 or profiler.enable(). Profiled functions are only
+wrapped while enabled, so disabled profiling costs nothing. enable/disable rebind the
+function in its module or class and in modules which imported it by name.
+"""
+from collections import deque
+from functools import wraps
+from typing import Callable, Optional, TextIO
+import os
+import sys
+import threading
+import time
+
+PROFILE_ENV = 'LIB_COMMON_PROFILE'
+# latencies kept per function for percentiles
+SAMPLE_SIZE = 10_000
+PERCENTILES = (50, 90, 99)
+
+_enabled: bool = os.environ.get(PROFILE_ENV, '').lower() in ('1', 'true', 'yes')
+_lock = threading.Lock()
+
+
+class CallStats:
+    __slots__ = ('count', 'total_ns', 'max_ns', 'samples')
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self) -> None:
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.samples: deque[int] = deque(maxlen=SAMPLE_SIZE)
+
+    def add(self, elapsed_ns: int) -> None:
+        self.count += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        self.samples.append(elapsed_ns)
+
+    def to_dict(self) -> dict[str, float]:
+        res = dict(count=self.count, total_ms=self.total_ns / 1e6,
+                   mean_us=self.total_ns / self.count / 1e3 if self.count else 0.0)
+        samples = sorted(self.samples)
+        for p in PERCENTILES:
+            res[f'p{p}_us'] = samples[min(len(samples) - 1, len(samples) * p // 100)] / 1e3 if samples else 0.0
+        res['max_us'] = self.max_ns / 1e3
+        return res
+
+
+_registry: dict[str, CallStats] = {}
+# (function, wrapper) of each profiled function
+_hooks: list[tuple[Callable, Callable]] = []
+
+
+def _get_owner(func: Callable):
+    owner = sys.modules.get(func.__module__)
+    for attr in func.__qualname__.split('.')[:-1]:
+        owner = getattr(owner, attr, None)
+    return owner
+
+def _rebind(replacements: dict[int, tuple[Callable, Callable]]) -> None:
+    """Replaces old by new for each (old, new) in its module or class and wherever imported by name."""
+    for old, new in replacements.values():
+        owner = _get_owner(old)
+        if owner is not None and vars(owner).get(old.__name__) is old:
+            setattr(owner, old.__name__, new)
+    for module in list(sys.modules.values()):
+        module_vars = getattr(module, '__dict__', None)
+        if not isinstance(module_vars, dict):
+            continue
+        for k, v in list(module_vars.items()):
+            old_new = replacements.get(id(v))
+            if old_new and v is old_new[0]:
+                module_vars[k] = old_new[1]
+
+def enable() -> None:
+    global _enabled
+    with _lock:
+        if not _enabled:
+            _enabled = True
+            _rebind({id(func): (func, wrapper) for func, wrapper in _hooks})
+
+def disable() -> None:
+    global _enabled
+    with _lock:
+        if _enabled:
+            _enabled = False
+            _rebind({id(wrapper): (wrapper, func) for func, wrapper in _hooks})
+
+def is_enabled() -> bool:
+    return _enabled
+
+def reset() -> None:
+    with _lock:
+        for stats in _registry.values():
+            stats.clear()
+
+
+def profiled(func: Callable = None, *, name: str = None):
+    """Decorator recording calls of func under name (default module.qualname).
+
+    Returns func itself unless profiling is enabled."""
+    if func is None:
+        return lambda f: profiled(f, name=name)
+    key = name or f'{func.__module__}.{func.__qualname__}'
+    with _lock:
+        stats = _registry.setdefault(key, CallStats())
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter_ns()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            stats.add(time.perf_counter_ns() - start)
+    with _lock:
+        _hooks.append((func, wrapper))
+        return wrapper if _enabled else func
+
+
+def get_stats(called_only: bool = True) -> dict[str, dict[str, float]]:
+    with _lock:
+        return {k: v.to_dict() for k, v in _registry.items() if v.count or not called_only}
+
+def to_table(sort_by: str = 'total_ms') -> str:
+    stats = sorted(get_stats().items(), key=lambda kv: kv[1][sort_by], reverse=True)
+    columns = ['count', 'total_ms', 'mean_us'] + [f'p{p}_us' for p in PERCENTILES] + ['max_us']
+    width = max([len('function')] + [len(k) for k, _ in stats])
+    lines = [f"{'function':<{width}} " + ' '.join(f'{c:>10}' for c in columns)]
+    for k, v in stats:
+        lines.append(f'{k:<{width}} {v["count"]:>10} ' + ' '.join(f'{v[c]:>10.2f}' for c in columns[1:]))
+    return '\n'.join(lines)
+
+def to_json() -> str:
+    import json
+    return json.dumps(get_stats(), indent=2)
+
+def dump(file: Optional[TextIO] = None, fmt: str = 'table') -> None:
+    match fmt:
+        case 'table':
+            out = to_table()
+        case 'json':
+            out = to_json()
+        case _:
+            raise ValueError(f'Unsupported format {fmt}')
+    print(out, file=file or sys.stderr)
@@ -1,10 +1,10 @@
-import requests
 import json
 
 URL_STATUS_OK = 200
 TIMEOUT_SECS = 20
 
 def url_get(url: str, params: dict[str, any] = None, headers: dict[str, any] = None, **kwargs):
+    import requests
     resp = requests.get(url, params=params, timeout=TIMEOUT_SECS, headers=headers, **kwargs)
     if resp.status_code == URL_STATUS_OK:
         return resp.content.decode()
@@ -17,6 +17,7 @@ def url_get(url: str, params: dict[str, any] = None, headers: dict[str, any] = N
     #         raise Exception(f'{u.url} URL request failed {u.reason}')
 
 def url_post(url: str, params: dict[str, any] = None, **kwargs):
+    import requests
     resp = requests.post(url, params=params, timeout=TIMEOUT_SECS, **kwargs)
     if resp.status_code == URL_STATUS_OK:
         return resp.content.decode()
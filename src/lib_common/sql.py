@@ -1,15 +1,19 @@
+from typing import Iterable, Sequence
 import sqlite3
 import logging
 
+from lib_common.profiler import profiled
+
 logger = logging.Logger(__name__)
 
 DATE_FORMAT = '%Y-%m-%d'
 
-def fetch(query: str, filename: str, count: int = 0):
+@profiled
+def fetch(query: str, filename: str, count: int = 0, params: Sequence = ()):
     connect = sqlite3.connect(filename)
     cursor = connect.cursor()
     try:
-        exec_obj = cursor.execute(query)
+        exec_obj = cursor.execute(query, params)
         if count == 1:
             res = exec_obj.fetchone()
         elif count > 1:
@@ -33,3 +37,15 @@ def modify(query: str, filename: str) -> bool:
     connect.close()
     return True
 
+# Executes query for each row of params in a single transaction
+def modify_many(query: str, filename: str, rows: Iterable[Sequence]) -> int:
+    connect = sqlite3.connect(filename)
+    try:
+        with connect:
+            count = connect.executemany(query, rows).rowcount
+        logger.error(f'modified {count} rows in {filename}: {query}')
+    except Exception as ex:
+        raise RuntimeError(f'Modify failed: {ex}')
+    finally:
+        connect.close()
+    return count